@@ -0,0 +1,103 @@
+"""Benchmark the coordinator's refresh cost against fleet size.
+
+Runs full refreshes against an in-memory API client, so only the
+coordinator's own work is timed. The per-system cost should stay flat as
+the fleet grows.
+
+    python benchmarks/bench_coordinator.py [--refreshes 20]
+"""
+
+import argparse
+import asyncio
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from homeassistant.config_entries import ConfigEntry  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.beszel.api import BeszelApiMetrics  # noqa: E402
+from custom_components.beszel.const import DOMAIN  # noqa: E402
+from custom_components.beszel.coordinator import (  # noqa: E402
+    BeszelDataUpdateCoordinator,
+)
+
+FLEET_SIZES = (250, 500, 1000, 2000)
+
+
+class FakeApiClient:
+    """API client answering from synthetic systems without any I/O."""
+
+    def __init__(self, fleet_size):
+        self.metrics = BeszelApiMetrics()
+        self.systems = [
+            {
+                "id": f"system{index:05d}",
+                "name": f"host-{index}",
+                "status": "up",
+                "info": {"c": 8, "m": "Synthetic CPU", "os": 0, "u": 86400},
+                "updated": "",
+            }
+            for index in range(fleet_size)
+        ]
+        self.stats = {
+            system["id"]: {"cpu": 12.5, "mp": 40.0, "dp": 55.0, "ns": 0.1, "nr": 0.2}
+            for system in self.systems
+        }
+
+    async def async_get_systems(self, systems_filter=None):
+        return self.systems
+
+    async def async_get_latest_system_stats_batch(self, system_ids, since):
+        return {system_id: self.stats[system_id] for system_id in system_ids}
+
+
+async def _time_refreshes(hass, fleet_size, refreshes):
+    """Return the mean duration of a full refresh for a fleet size."""
+    entry = ConfigEntry(
+        data={},
+        discovery_keys={},
+        domain=DOMAIN,
+        minor_version=1,
+        options={},
+        source="user",
+        title="Benchmark",
+        unique_id=None,
+        version=1,
+    )
+    coordinator = BeszelDataUpdateCoordinator(
+        hass, entry, FakeApiClient(fleet_size), 60
+    )
+    elapsed = 0.0
+    for refresh in range(refreshes):
+        # Mark every system as moved so each refresh refetches the fleet
+        for system in coordinator.api_client.systems:
+            system["updated"] = str(refresh)
+        coordinator._next_due = {}
+        started = time.perf_counter()
+        coordinator.data = await coordinator._async_fetch_data()
+        elapsed += time.perf_counter() - started
+    return elapsed / refreshes
+
+
+async def main(refreshes):
+    """Print the refresh cost for each fleet size."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        print(f"{'systems':>8} {'ms/refresh':>11} {'us/system':>10}")
+        for fleet_size in FLEET_SIZES:
+            seconds = await _time_refreshes(hass, fleet_size, refreshes)
+            print(
+                f"{fleet_size:>8} {seconds * 1000:>11.2f} "
+                f"{seconds / fleet_size * 1e6:>10.2f}"
+            )
+        await hass.async_stop(force=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--refreshes", type=int, default=20)
+    asyncio.run(main(parser.parse_args().refreshes))
@@ -0,0 +1,131 @@
+"""Benchmark sensor state writes for a large number of entities.
+
+Builds system sensors from synthetic coordinator data and times full
+state writes through Home Assistant's state machine, plus bare value
+reads, with every value changing between rounds.
+
+    python benchmarks/bench_sensor_writes.py [--entities 5000] [--rounds 10]
+"""
+
+import argparse
+import asyncio
+from datetime import timedelta
+import logging
+from pathlib import Path
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from homeassistant.config_entries import ConfigEntry  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers.entity_platform import EntityPlatform  # noqa: E402
+
+from custom_components.beszel.api import BeszelApiMetrics  # noqa: E402
+from custom_components.beszel.const import DOMAIN  # noqa: E402
+from custom_components.beszel.coordinator import (  # noqa: E402
+    BeszelDataUpdateCoordinator,
+)
+from custom_components.beszel.sensor import (  # noqa: E402
+    SENSOR_TYPES_INFO,
+    SENSOR_TYPES_STATS,
+    BeszelSensor,
+)
+
+DESCRIPTIONS = (*SENSOR_TYPES_INFO, *SENSOR_TYPES_STATS)
+
+
+def _system_data(system_id, value):
+    """Return synthetic coordinator data for one system."""
+    return {
+        "id": system_id,
+        "info": {"c": 8, "k": "6.1.0", "m": "Synthetic CPU", "os": 0, "t": 16},
+        "name": system_id,
+        "stats": {
+            "cpu": value,
+            "d": 500,
+            "dp": value,
+            "dr": value / 10,
+            "du": value * 5,
+            "dw": value / 10,
+            "m": 32,
+            "mb": value / 8,
+            "mp": value,
+            "mu": value / 4,
+            "nr": value / 10,
+            "ns": value / 10,
+            "s": 8,
+            "su": value / 20,
+        },
+        "status": "up",
+    }
+
+
+async def main(entity_count, rounds):
+    """Print state writes and value reads per second."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        entry = ConfigEntry(
+            data={},
+            discovery_keys={},
+            domain=DOMAIN,
+            minor_version=1,
+            options={},
+            source="user",
+            title="Benchmark",
+            unique_id=None,
+            version=1,
+        )
+        client = type("FakeApiClient", (), {"metrics": BeszelApiMetrics()})()
+        coordinator = BeszelDataUpdateCoordinator(hass, entry, client, 60)
+        platform = EntityPlatform(
+            hass=hass,
+            logger=logging.getLogger(__name__),
+            domain="sensor",
+            platform_name=DOMAIN,
+            platform=None,
+            scan_interval=timedelta(seconds=60),
+            entity_namespace=None,
+        )
+        system_count = -(-entity_count // len(DESCRIPTIONS))
+        system_ids = [f"system{index:05d}" for index in range(system_count)]
+
+        entities = []
+        for system_id in system_ids:
+            for description in DESCRIPTIONS:
+                entity = BeszelSensor(coordinator, system_id, system_id, description)
+                entity.hass = hass
+                entity.platform = platform
+                entity.entity_id = f"sensor.{entity.unique_id}"
+                entities.append(entity)
+        entities = entities[:entity_count]
+
+        write_seconds = read_seconds = 0.0
+        for round_index in range(rounds):
+            coordinator.data = {
+                system_id: _system_data(system_id, 10.0 + round_index)
+                for system_id in system_ids
+            }
+            started = time.perf_counter()
+            for entity in entities:
+                entity.native_value
+            read_seconds += time.perf_counter() - started
+            started = time.perf_counter()
+            for entity in entities:
+                entity.async_write_ha_state()
+            write_seconds += time.perf_counter() - started
+
+        total = len(entities) * rounds
+        print(f"entities:        {len(entities)}")
+        print(f"state writes/s:  {total / write_seconds:,.0f}")
+        print(f"value reads/s:   {total / read_seconds:,.0f}")
+        await hass.async_stop(force=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entities", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.entities, args.rounds))
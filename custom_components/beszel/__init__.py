@@ -1,37 +1,228 @@
 """The Beszel integration."""
 
+import logging
+import time
+
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.storage import Store
 
-from .api import BeszelApiClient
-from .const import DEFAULT_UPDATE_INTERVAL_SECONDS, DOMAIN, PLATFORMS
+from .api import BeszelApiClient, build_systems_filter
+from .const import (
+    AVERAGED_STATS_TYPES,
+    CONF_AVERAGED_STATS_TYPE,
+    CONF_ENABLE_CONTAINERS,
+    CONF_ENABLE_INFO,
+    CONF_EXCLUDE_SYSTEMS,
+    CONF_HISTORY_SIZE,
+    CONF_INCLUDE_STATUSES,
+    CONF_INCLUDE_SYSTEMS,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MIRROR_ALERTS,
+    CONF_REALTIME,
+    CONF_REQUEST_TIMEOUT,
+    CONF_REQUESTS_PER_SECOND,
+    CONF_THRESHOLD_HYSTERESIS,
+    CONF_UPDATE_INTERVAL,
+    DEFAULT_AVERAGED_STATS_TYPE,
+    DEFAULT_ENABLE_CONTAINERS,
+    DEFAULT_ENABLE_GROUP,
+    DEFAULT_HISTORY_SIZE,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MIRROR_ALERTS,
+    DEFAULT_REALTIME,
+    DEFAULT_REQUEST_TIMEOUT_SECONDS,
+    DEFAULT_REQUESTS_PER_SECOND,
+    DEFAULT_THRESHOLD_HYSTERESIS,
+    DEFAULT_UPDATE_INTERVAL_SECONDS,
+    DOMAIN,
+    PLATFORMS,
+    STORAGE_VERSION,
+    STATS_GROUP_OPTIONS,
+    THRESHOLD_OPTIONS,
+)
 from .coordinator import BeszelDataUpdateCoordinator
 
+_LOGGER = logging.getLogger(__name__)
+
+
+def _client_limits(options):
+    """Return the API client limits configured in the options."""
+    return (
+        options.get(CONF_MAX_CONCURRENT_REQUESTS, DEFAULT_MAX_CONCURRENT_REQUESTS),
+        options.get(CONF_REQUESTS_PER_SECOND, DEFAULT_REQUESTS_PER_SECOND),
+        options.get(CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT_SECONDS),
+    )
+
+
+def _split_patterns(value):
+    """Split a comma separated option into its non-empty patterns."""
+    return [pattern.strip() for pattern in (value or "").split(",") if pattern.strip()]
+
+
+def _system_patterns(options):
+    """Return the include and exclude system patterns set in the options."""
+    return (
+        tuple(_split_patterns(options.get(CONF_INCLUDE_SYSTEMS))),
+        tuple(_split_patterns(options.get(CONF_EXCLUDE_SYSTEMS))),
+    )
+
+
+def _systems_filter(options):
+    """Return the hub filter for the systems selected by name or id.
+
+    Statuses change at runtime, so they are applied by the coordinator
+    instead; a system that goes down must still be listed by the hub.
+    """
+    return build_systems_filter(*_system_patterns(options))
+
+
+def _thresholds(options):
+    """Return the enabled metric limits as metric name to stats key and limit."""
+    thresholds = {}
+    for option, (metric, stats_key, default) in THRESHOLD_OPTIONS.items():
+        limit = options.get(option, default)
+        if limit:
+            thresholds[metric] = (stats_key, limit)
+    return thresholds
+
+
+def _reload_options(options):
+    """Return the options that change which entities or tasks exist."""
+    return (
+        options.get(CONF_AVERAGED_STATS_TYPE, DEFAULT_AVERAGED_STATS_TYPE),
+        _systems_filter(options),
+        _system_patterns(options),
+        frozenset(options.get(CONF_INCLUDE_STATUSES, [])),
+        options.get(CONF_REALTIME, DEFAULT_REALTIME),
+        options.get(CONF_ENABLE_CONTAINERS, DEFAULT_ENABLE_CONTAINERS),
+        options.get(CONF_MIRROR_ALERTS, DEFAULT_MIRROR_ALERTS),
+        options.get(CONF_THRESHOLD_HYSTERESIS, DEFAULT_THRESHOLD_HYSTERESIS),
+        _thresholds(options),
+        options.get(CONF_ENABLE_INFO, DEFAULT_ENABLE_GROUP),
+        *(options.get(key, DEFAULT_ENABLE_GROUP) for key in STATS_GROUP_OPTIONS),
+    )
+
 
 async def async_setup_entry(hass, entry):
     """Set up Beszel from a config entry."""
     hass.data.setdefault(DOMAIN, {})
 
     api_client = BeszelApiClient(
-        entry.data["Host"], entry.data["Username"], entry.data["Password"]
+        entry.data["Host"],
+        entry.data["Username"],
+        entry.data["Password"],
+        async_get_clientsession(hass),
+        *_client_limits(entry.options),
+    )
+
+    averaged_stats_type = entry.options.get(
+        CONF_AVERAGED_STATS_TYPE, DEFAULT_AVERAGED_STATS_TYPE
     )
+    if averaged_stats_type not in AVERAGED_STATS_TYPES:
+        averaged_stats_type = None
 
     coordinator = BeszelDataUpdateCoordinator(
         hass,
+        entry,
         api_client=api_client,
-        update_interval_seconds=DEFAULT_UPDATE_INTERVAL_SECONDS,
+        update_interval_seconds=entry.options.get(
+            CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL_SECONDS
+        ),
+        disabled_stats_keys=frozenset(
+            stats_key
+            for option, stats_key in STATS_GROUP_OPTIONS.items()
+            if not entry.options.get(option, DEFAULT_ENABLE_GROUP)
+        ),
+        systems_filter=_systems_filter(entry.options),
+        system_patterns=_system_patterns(entry.options),
+        include_statuses=frozenset(entry.options.get(CONF_INCLUDE_STATUSES, [])),
+        history_size=entry.options.get(CONF_HISTORY_SIZE, DEFAULT_HISTORY_SIZE),
+        averaged_stats_type=averaged_stats_type,
+        containers_enabled=entry.options.get(
+            CONF_ENABLE_CONTAINERS, DEFAULT_ENABLE_CONTAINERS
+        ),
+        thresholds=_thresholds(entry.options),
+        threshold_hysteresis=entry.options.get(
+            CONF_THRESHOLD_HYSTERESIS, DEFAULT_THRESHOLD_HYSTERESIS
+        ),
+        alerts_enabled=entry.options.get(CONF_MIRROR_ALERTS, DEFAULT_MIRROR_ALERTS),
     )
+    coordinator.reload_options = _reload_options(entry.options)
+
+    entry.async_on_unload(api_client.close)
+
+    # Start from the last saved snapshot when there is one, so entities are
+    # available at once while the live refresh runs in the background.
+    started = time.monotonic()
+    restored = await coordinator.async_load_snapshot()
+    if not restored:
+        await coordinator.async_config_entry_first_refresh()
+    coordinator.setup_timings["initial_data"] = time.monotonic() - started
 
-    await coordinator.async_config_entry_first_refresh()
     hass.data[DOMAIN][entry.entry_id] = coordinator
+    started = time.monotonic()
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    coordinator.setup_timings["platforms"] = time.monotonic() - started
+    _LOGGER.debug(
+        "Setup of %s took %s",
+        entry.title,
+        ", ".join(
+            f"{phase} {seconds:.3f}s"
+            for phase, seconds in coordinator.setup_timings.items()
+        ),
+    )
+    if restored:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN}_initial_refresh"
+        )
+
+    if averaged_stats_type:
+        entry.async_on_unload(coordinator.async_track_averaged_stats())
+        entry.async_create_background_task(
+            hass,
+            coordinator.async_refresh_averaged_stats(),
+            f"{DOMAIN}_averaged_stats",
+        )
+
+    if entry.options.get(CONF_REALTIME, DEFAULT_REALTIME):
+        entry.async_create_background_task(
+            hass, coordinator.async_run_realtime(), f"{DOMAIN}_realtime"
+        )
+
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
 
     return True
 
 
+async def async_update_options(hass, entry):
+    """Apply changed options, reloading only when entities or tasks change."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    if _reload_options(entry.options) != coordinator.reload_options:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    coordinator.api_client.set_limits(*_client_limits(entry.options))
+    coordinator.set_update_interval(
+        entry.options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL_SECONDS)
+    )
+    coordinator.set_history_size(
+        entry.options.get(CONF_HISTORY_SIZE, DEFAULT_HISTORY_SIZE)
+    )
+
+
+async def async_remove_entry(hass, entry):
+    """Delete the saved snapshot when a config entry is removed."""
+    await Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}").async_remove()
+
+
 async def async_unload_entry(hass, entry):
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        # Flush the delayed snapshot save so it cannot rewrite the file
+        # after the entry is removed.
+        await coordinator.async_save_snapshot()
     return unload_ok
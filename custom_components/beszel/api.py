@@ -1,97 +1,543 @@
 """API for Beszel."""
 
 import asyncio
+import base64
+import bisect
+from fnmatch import fnmatchcase
+import json
+import time
+from urllib.parse import quote
 
-from pocketbase import PocketBase
-from pocketbase.utils import ClientResponseError, validate_token
+import aiohttp
 
+from .const import (
+    ALERT_FIELDS,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_REQUEST_TIMEOUT_SECONDS,
+    DEFAULT_REQUESTS_PER_SECOND,
+    LATENCY_BUCKETS_SECONDS,
+    LIST_PAGE_SIZE,
+    REALTIME_READ_TIMEOUT_SECONDS,
+    STATS_BATCH_CHUNK_SIZE,
+    STATS_TYPE_LATEST,
+    SYSTEM_FIELDS,
+    SYSTEM_STATS_FIELDS,
+    TOKEN_RENEW_MARGIN_SECONDS,
+)
 
-class BeszelApiAuthError(Exception):
+
+class BeszelApiError(Exception):
+    """Custom exception for API errors."""
+
+    def __init__(self, message, status=None):
+        """Initialize the exception with an optional HTTP status."""
+        super().__init__(message)
+        self.status = status
+
+
+class BeszelApiAuthError(BeszelApiError):
     """Custom exception for authentication errors."""
 
 
+def _decode_token_expiry(token):
+    """Return the expiry timestamp of a PocketBase JWT, or 0 if unreadable."""
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        return float(json.loads(base64.urlsafe_b64decode(payload)).get("exp", 0))
+    except (AttributeError, IndexError, TypeError, ValueError):
+        return 0
+
+
+def _filter_string(value):
+    """Quote a value for use in a PocketBase filter expression."""
+    return '"' + value.replace('"', '\\"') + '"'
+
+
+def _is_glob(pattern):
+    """Return True if a system pattern contains glob wildcards."""
+    return "*" in pattern or "?" in pattern
+
+
+def _system_match(pattern, negate=False, relation=""):
+    """Return a filter term matching a system by name glob or id.
+
+    PocketBase only treats a `~` value as a raw, anchored LIKE pattern when
+    it contains `%`, so both wildcards map to `%`. That selects a superset
+    of the glob, which `system_matches` narrows down client-side. Excluded
+    globs can only be sent when the LIKE pattern is exact, otherwise None is
+    returned. `relation` prefixes the fields to match through a relation.
+    """
+    name, record_id = f"{relation}name", relation.rstrip(".") or "id"
+    if _is_glob(pattern):
+        like = _filter_string(pattern.replace("*", "%").replace("?", "%"))
+        if not negate:
+            return f"{name}~{like}"
+        if any(char in pattern for char in "?%_"):
+            return None
+        return f"{name}!~{like}"
+    value = _filter_string(pattern)
+    if negate:
+        return f"({name}!={value} && {record_id}!={value})"
+    return f"{name}={value} || {record_id}={value}"
+
+
+def _pattern_matches(pattern, system):
+    """Return True if a system record matches a name glob or exact name or id."""
+    if _is_glob(pattern):
+        return fnmatchcase(system.get("name", "").lower(), pattern.lower())
+    return pattern in (system.get("name"), system.get("id"))
+
+
+def system_matches(system, include=(), exclude=()):
+    """Return True if a system record passes the include and exclude patterns."""
+    if include and not any(_pattern_matches(p, system) for p in include):
+        return False
+    return not any(_pattern_matches(p, system) for p in exclude)
+
+
+def build_systems_filter(include=(), exclude=(), statuses=(), relation=None):
+    """Build a PocketBase filter selecting systems by name glob, id and status.
+
+    Plain patterns match a system's exact name or id. Name globs are only
+    prefiltered by the hub, so results must be checked with
+    `system_matches`. With `relation`, records of another collection are
+    selected through that system relation field. Returns None to select all.
+    """
+    prefix = f"{relation}." if relation else ""
+    terms = []
+    if include:
+        terms.append(
+            "(" + " || ".join(_system_match(p, relation=prefix) for p in include) + ")"
+        )
+    terms.extend(
+        term
+        for term in (_system_match(p, True, prefix) for p in exclude)
+        if term is not None
+    )
+    if statuses:
+        terms.append(
+            "("
+            + " || ".join(f"{prefix}status={_filter_string(s)}" for s in statuses)
+            + ")"
+        )
+    return " && ".join(terms) or None
+
+
+class BeszelTokenManager:
+    """Hold the hub auth token with its expiry, decoded once per token."""
+
+    def __init__(self):
+        """Initialize an empty token manager."""
+        self.expiry = 0
+        self.token = None
+
+    def clear(self):
+        """Forget the current token."""
+        self.set_token(None)
+
+    def set_token(self, token):
+        """Store a new token and cache its expiry."""
+        self.token = token
+        self.expiry = _decode_token_expiry(token) if token else 0
+
+    @property
+    def is_valid(self):
+        """Return True if a token is held and has not expired."""
+        return self.token is not None and self.expiry > time.time()
+
+    @property
+    def seconds_until_renewal(self):
+        """Return the delay before the token should be renewed."""
+        return max(self.expiry - TOKEN_RENEW_MARGIN_SECONDS - time.time(), 0)
+
+
+class BeszelApiMetrics:
+    """Request counters and per-endpoint latency histograms."""
+
+    def __init__(self):
+        """Initialize all counters at zero."""
+        self.auth_renewals = 0
+        self.bytes_received = 0
+        self.endpoints = {}
+        self.failures = 0
+        self.latency_seconds = 0.0
+        self.requests = 0
+
+    def record(self, endpoint, seconds, size, failed):
+        """Record one completed or failed request."""
+        self.bytes_received += size
+        self.latency_seconds += seconds
+        self.requests += 1
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = self.endpoints[endpoint] = {
+                "buckets": [0] * (len(LATENCY_BUCKETS_SECONDS) + 1),
+                "bytes": 0,
+                "failures": 0,
+                "max_seconds": 0.0,
+                "requests": 0,
+                "total_seconds": 0.0,
+            }
+        stats["buckets"][bisect.bisect_left(LATENCY_BUCKETS_SECONDS, seconds)] += 1
+        stats["bytes"] += size
+        stats["max_seconds"] = max(stats["max_seconds"], seconds)
+        stats["requests"] += 1
+        stats["total_seconds"] += seconds
+        if failed:
+            self.failures += 1
+            stats["failures"] += 1
+
+
+class BeszelRateLimiter:
+    """Token bucket that spreads requests evenly over time."""
+
+    def __init__(self, rate, burst):
+        """Initialize the bucket with a refill rate per second and a burst size."""
+        self._burst = burst
+        self._lock = asyncio.Lock()
+        self._rate = rate
+        self._tokens = burst
+        self._updated = time.monotonic()
+
+    async def acquire(self):
+        """Wait until a request may be sent."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._burst, self._tokens + (now - self._updated) * self._rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+
 class BeszelApiClient:
     """Beszel API Client."""
 
-    def __init__(self, host, username, password):
+    def __init__(
+        self,
+        host,
+        username,
+        password,
+        session,
+        max_concurrent_requests=DEFAULT_MAX_CONCURRENT_REQUESTS,
+        requests_per_second=DEFAULT_REQUESTS_PER_SECOND,
+        request_timeout=DEFAULT_REQUEST_TIMEOUT_SECONDS,
+    ):
         """Initialize the API client."""
         if not host.startswith(("http://", "https://")):
             host = f"http://{host}"
-        self._client = PocketBase(host)
-        self._host = host
-        self._is_authenticated = False
+        self._auth_lock = asyncio.Lock()
+        self._host = host.rstrip("/")
+        self.metrics = BeszelApiMetrics()
         self._password = password
+        self._renew_handle = None
+        self._renew_task = None
+        self._session = session
+        self._tokens = BeszelTokenManager()
         self._username = username
+        self.set_limits(max_concurrent_requests, requests_per_second, request_timeout)
+
+    def set_limits(self, max_concurrent_requests, requests_per_second, request_timeout):
+        """Apply new concurrency, rate and timeout limits to subsequent requests."""
+        self._rate_limiter = (
+            BeszelRateLimiter(requests_per_second, max_concurrent_requests)
+            if requests_per_second > 0
+            else None
+        )
+        self._request_semaphore = asyncio.Semaphore(max_concurrent_requests)
+        self._timeout = aiohttp.ClientTimeout(total=request_timeout)
+
+    def close(self):
+        """Cancel any scheduled token renewal."""
+        if self._renew_handle:
+            self._renew_handle.cancel()
+            self._renew_handle = None
+        if self._renew_task:
+            self._renew_task.cancel()
+            self._renew_task = None
+
+    def _schedule_renewal(self):
+        """Schedule a background token renewal shortly before expiry."""
+        if self._renew_handle:
+            self._renew_handle.cancel()
+        loop = asyncio.get_running_loop()
+        self._renew_handle = loop.call_later(
+            self._tokens.seconds_until_renewal, self._start_renewal
+        )
+
+    def _start_renewal(self):
+        """Start the token renewal task."""
+        self._renew_handle = None
+        self._renew_task = asyncio.get_running_loop().create_task(
+            self._async_renew_token()
+        )
+
+    async def _async_renew_token(self):
+        """Renew the auth token, falling back to a fresh login on next use."""
+        async with self._auth_lock:
+            try:
+                result = await self._send(
+                    "POST", "/api/collections/users/auth-refresh", authenticated=True
+                )
+            except BeszelApiError:
+                self._tokens.clear()
+                return
+            self._tokens.set_token(result.get("token"))
+            self.metrics.auth_renewals += 1
+            if self._tokens.is_valid:
+                self._schedule_renewal()
 
     async def _ensure_auth(self):
         """Ensure the client is authenticated before making a request."""
-        if not (
-            self._is_authenticated
-            and self._client.auth_store.token
-            and self._client.auth_store.model
-            and validate_token(self._client.auth_store.token)
-        ):
+        if not self._tokens.is_valid:
             await self.async_authenticate()
 
-    async def async_authenticate(self):
-        """Authenticate with the Beszel Hub."""
-        if (
-            self._is_authenticated
-            and self._client.auth_store.token
-            and self._client.auth_store.model
-            and validate_token(self._client.auth_store.token)
-        ):
-            return
+    async def _send(
+        self, method, path, params=None, json_data=None, authenticated=False
+    ):
+        """Send a single request to the hub and return the decoded JSON body."""
+        headers = {}
+        if authenticated and self._tokens.token:
+            headers["Authorization"] = self._tokens.token
+        endpoint = path.removeprefix("/api/").removeprefix("collections/")
+        endpoint = f"{method} {endpoint.removesuffix('/records')}"
+
+        async with self._request_semaphore:
+            if self._rate_limiter:
+                await self._rate_limiter.acquire()
+            started = time.monotonic()
+            body = b""
+            failed = True
+            try:
+                async with self._session.request(
+                    method,
+                    f"{self._host}{path}",
+                    headers=headers,
+                    json=json_data,
+                    params=params,
+                    timeout=self._timeout,
+                ) as response:
+                    status = response.status
+                    body = await response.read()
+                data = json.loads(body) if body else None
+                failed = status >= 400
+            except (aiohttp.ClientError, TimeoutError, ValueError) as e:
+                raise BeszelApiError(f"Error communicating with Beszel Hub: {e}") from e
+            finally:
+                self.metrics.record(
+                    endpoint,
+                    time.monotonic() - started,
+                    len(body),
+                    failed,
+                )
 
+        if status == 401 or status == 403:
+            raise BeszelApiAuthError(
+                "Token likely expired, re-authentication needed", status
+            )
+        if status >= 400:
+            message = data.get("message") if isinstance(data, dict) else None
+            raise BeszelApiError(message or f"HTTP {status}", status)
+        return data
+
+    async def _request(self, method, path, params=None, json_data=None):
+        """Send an authenticated request, re-authenticating once on rejection."""
+        await self._ensure_auth()
         try:
-            await asyncio.to_thread(
-                self._client.collection("users").auth_with_password,
-                self._username,
-                self._password,
+            return await self._send(method, path, params, json_data, authenticated=True)
+        except BeszelApiAuthError:
+            self._tokens.clear()
+            await self.async_authenticate()
+            return await self._send(method, path, params, json_data, authenticated=True)
+
+    async def _get_list(self, collection, page, per_page, query_params):
+        """Fetch a single page of records from a collection."""
+        return await self._request(
+            "GET",
+            f"/api/collections/{collection}/records",
+            params={**query_params, "page": page, "perPage": per_page},
+        )
+
+    async def _get_full_list(self, collection, per_page, query_params):
+        """Fetch every record of a collection matching the query."""
+        records = []
+        page = 1
+        while True:
+            result = await self._get_list(
+                collection, page, per_page, {**query_params, "skipTotal": 1}
             )
-            self._is_authenticated = True
-        except ClientResponseError as e:
-            self._is_authenticated = False
-            raise BeszelApiAuthError("Authentication failed") from e
+            items = result.get("items", [])
+            records.extend(items)
+            if len(items) < per_page:
+                return records
+            page += 1
+
+    async def async_authenticate(self):
+        """Authenticate with the Beszel Hub."""
+        async with self._auth_lock:
+            if self._tokens.is_valid:
+                return
+
+            try:
+                result = await self._send(
+                    "POST",
+                    "/api/collections/users/auth-with-password",
+                    json_data={"identity": self._username, "password": self._password},
+                )
+            except BeszelApiError as e:
+                self._tokens.clear()
+                if e.status is not None and e.status < 500:
+                    raise BeszelApiAuthError("Authentication failed", e.status) from e
+                raise
+
+            self._tokens.set_token(result.get("token"))
+            if not self._tokens.is_valid:
+                raise BeszelApiAuthError("Authentication failed")
+            self._schedule_renewal()
 
     async def async_get_latest_system_stats(self, system_id):
         """Fetch the latest stats for a specific system."""
-        await self._ensure_auth()
-        try:
-            records = await asyncio.to_thread(
-                self._client.collection("system_stats").get_full_list,
-                batch=1,
-                query_params={
-                    "filter": f'system="{system_id}"',
+        result = await self._get_list(
+            "system_stats",
+            1,
+            1,
+            {
+                "fields": "stats",
+                "filter": f'system="{system_id}" && type="{STATS_TYPE_LATEST}"',
+                "skipTotal": 1,
+                "sort": "-created",
+            },
+        )
+        items = result.get("items", [])
+        if items:
+            return items[0].get("stats", {})
+        return None
+
+    async def _get_latest_stats_batch(self, collection, system_ids, since, stats_type):
+        """Fetch the latest stats records of a type for many systems since a time.
+
+        Systems are queried in chunks to keep the filter within URL length
+        limits, and the newest record per system is picked client-side.
+        Systems without a record in the window are absent from the result.
+        """
+        since_filter = since.strftime("%Y-%m-%d %H:%M:%S")
+        latest_stats = {}
+        for start in range(0, len(system_ids), STATS_BATCH_CHUNK_SIZE):
+            chunk = system_ids[start : start + STATS_BATCH_CHUNK_SIZE]
+            systems_filter = " || ".join(f'system="{system_id}"' for system_id in chunk)
+            records = await self._get_full_list(
+                collection,
+                LIST_PAGE_SIZE,
+                {
+                    "fields": "system,stats",
+                    "filter": (
+                        f'type="{stats_type}" && '
+                        f'created>="{since_filter}" && ({systems_filter})'
+                    ),
                     "sort": "-created",
                 },
             )
-            if records:
-                return vars(records[0]).get("stats", {})
-            return None
-        except ClientResponseError as e:
-            if e.status == 401 or e.status == 403:
-                self._is_authenticated = False
-                raise BeszelApiAuthError(
-                    "Token likely expired, re-authentication needed"
-                ) from e
-            raise
-        except IndexError:
-            return None
+            for record in records:
+                latest_stats.setdefault(record.get("system"), record.get("stats"))
+        return latest_stats
 
-    async def async_get_systems(self):
-        """Fetch all systems from the Beszel Hub."""
-        await self._ensure_auth()
+    async def async_get_latest_container_stats_batch(self, system_ids, since):
+        """Fetch the latest container snapshot for many systems since a given time."""
+        return await self._get_latest_stats_batch(
+            "container_stats", system_ids, since, STATS_TYPE_LATEST
+        )
+
+    async def async_get_latest_system_stats_batch(
+        self, system_ids, since, stats_type=STATS_TYPE_LATEST
+    ):
+        """Fetch the latest stats of a type for many systems recorded since a time."""
+        return await self._get_latest_stats_batch(
+            "system_stats", system_ids, since, stats_type
+        )
+
+    async def async_get_alerts(self):
+        """Fetch the alerts configured on the Beszel Hub."""
+        return await self._get_full_list(
+            "alerts", LIST_PAGE_SIZE, {"fields": ALERT_FIELDS}
+        )
+
+    async def async_get_systems(self, systems_filter=None):
+        """Fetch all systems, or those matching a filter, from the Beszel Hub."""
+        query_params = {"fields": SYSTEM_FIELDS, "sort": "-status,name"}
+        if systems_filter:
+            query_params["filter"] = systems_filter
+        return await self._get_full_list("systems", LIST_PAGE_SIZE, query_params)
+
+    async def async_listen_realtime(self, collections, on_connect, on_event, filters):
+        """Stream realtime record events for the given collections.
+
+        Subscribes to the hub's server-sent event stream, calls `on_connect`
+        once the subscription is active and `on_event(collection, action, record)`
+        for each record change. `filters` maps a collection to a filter applied
+        by the hub. Returns when the hub closes the stream.
+        """
+        fields = {
+            "alerts": ALERT_FIELDS,
+            "container_stats": SYSTEM_STATS_FIELDS,
+            "systems": SYSTEM_FIELDS,
+            "system_stats": SYSTEM_STATS_FIELDS,
+        }
+        topics = {}
+        for collection in collections:
+            query = {"fields": fields[collection]} if collection in fields else {}
+            if filters.get(collection):
+                query["filter"] = filters[collection]
+            topic = f"{collection}/*"
+            if query:
+                options = json.dumps({"query": query}, separators=(",", ":"))
+                topic = f"{topic}?options={quote(options)}"
+            topics[topic] = collection
         try:
-            records = await asyncio.to_thread(
-                self._client.collection("systems").get_full_list,
-                query_params={"sort": "-status,name"},
-            )
-            return [vars(record) for record in records]
-        except ClientResponseError as e:
-            if e.status == 401 or e.status == 403:
-                self._is_authenticated = False
-                raise BeszelApiAuthError(
-                    "Token likely expired, re-authentication needed"
-                ) from e
-            raise
+            async with self._session.get(
+                f"{self._host}/api/realtime",
+                headers={"Accept": "text/event-stream"},
+                timeout=aiohttp.ClientTimeout(
+                    total=None, sock_read=REALTIME_READ_TIMEOUT_SECONDS
+                ),
+            ) as response:
+                if response.status != 200:
+                    raise BeszelApiError(
+                        f"Realtime stream rejected with HTTP {response.status}",
+                        response.status,
+                    )
+
+                event_name = None
+                data_lines = []
+                async for raw_line in response.content:
+                    line = raw_line.decode().rstrip("\r\n")
+                    if line.startswith("event:"):
+                        event_name = line[6:].strip()
+                    elif line.startswith("data:"):
+                        data_lines.append(line[5:].strip())
+                    elif not line and data_lines:
+                        payload = json.loads("\n".join(data_lines))
+                        if event_name == "PB_CONNECT":
+                            await self._request(
+                                "POST",
+                                "/api/realtime",
+                                json_data={
+                                    "clientId": payload.get("clientId"),
+                                    "subscriptions": list(topics),
+                                },
+                            )
+                            on_connect()
+                        elif event_name in topics:
+                            on_event(
+                                topics[event_name],
+                                payload.get("action"),
+                                payload.get("record", {}),
+                            )
+                        event_name = None
+                        data_lines = []
+        except (aiohttp.ClientError, TimeoutError, ValueError) as e:
+            raise BeszelApiError(f"Realtime stream failed: {e}") from e
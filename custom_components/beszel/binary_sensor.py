@@ -0,0 +1,161 @@
+"""Binary sensor platform for Beszel."""
+
+from homeassistant.components.binary_sensor import (
+    BinarySensorDeviceClass,
+    BinarySensorEntity,
+    BinarySensorEntityDescription,
+)
+
+from .const import DOMAIN
+from .entity import BeszelCoordinatorEntity, async_add_system_entities
+
+BINARY_SENSOR_TYPES_THRESHOLD = (
+    BinarySensorEntityDescription(
+        key="cpu",
+        name="CPU Alert",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        icon="mdi:cpu-64-bit",
+    ),
+    BinarySensorEntityDescription(
+        key="memory",
+        name="Memory Alert",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        icon="mdi:memory",
+    ),
+    BinarySensorEntityDescription(
+        key="disk",
+        name="Disk Alert",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        icon="mdi:harddisk",
+    ),
+    BinarySensorEntityDescription(
+        key="temperature",
+        name="Temperature Alert",
+        device_class=BinarySensorDeviceClass.PROBLEM,
+        icon="mdi:thermometer-alert",
+    ),
+)
+
+
+async def async_setup_entry(hass, entry, async_add_entities):
+    """Set up Beszel binary sensor entities based on a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    descriptions = [
+        description
+        for description in BINARY_SENSOR_TYPES_THRESHOLD
+        if description.key in coordinator.thresholds
+    ]
+
+    def _create_entities(system_id, system_data, known_keys):
+        """Create entities for a system's keys not in known_keys."""
+        entities = []
+        system_name = system_data.get("name", system_id)
+        if (system_id,) not in known_keys:
+            known_keys.add((system_id,))
+            entities.extend(
+                BeszelThresholdBinarySensor(
+                    coordinator, system_id, system_name, description
+                )
+                for description in descriptions
+            )
+        for alert_name in system_data.get("alerts", {}):
+            if (system_id, "alerts", alert_name) in known_keys:
+                continue
+            known_keys.add((system_id, "alerts", alert_name))
+            entities.append(
+                BeszelHubAlertBinarySensor(
+                    coordinator, system_id, system_name, alert_name
+                )
+            )
+        return entities
+
+    await async_add_system_entities(
+        entry,
+        coordinator,
+        async_add_entities,
+        _create_entities,
+        "binary_sensor_entities",
+    )
+
+
+class BeszelSystemBinarySensor(BeszelCoordinatorEntity, BinarySensorEntity):
+    """Base for binary sensors belonging to one Beszel system."""
+
+    _attr_has_entity_name = True
+
+    def __init__(self, coordinator, system_id, system_name):
+        """Initialize the binary sensor."""
+        super().__init__(coordinator)
+        self._system_id = system_id
+        self._system_name = system_name
+        self._attr_device_info = coordinator.device_infos.get(system_id)
+
+    def _state_values(self):
+        """Return the values that make up the written state."""
+        return (self.is_on,)
+
+    @property
+    def available(self):
+        """Return True if entity is available."""
+        if not super().available:
+            return False
+
+        system_specific_data = self.coordinator.data.get(self._system_id)
+        return bool(system_specific_data) and "error" not in system_specific_data
+
+
+class BeszelThresholdBinarySensor(BeszelSystemBinarySensor):
+    """On while a system metric is over its configured limit."""
+
+    def __init__(self, coordinator, system_id, system_name, description):
+        """Initialize the threshold binary sensor."""
+        super().__init__(coordinator, system_id, system_name)
+        self.entity_description = description
+        self._attr_unique_id = f"{DOMAIN}_{system_id}_threshold_{description.key}"
+
+    @property
+    def extra_state_attributes(self):
+        """Return the configured limit."""
+        return {
+            "threshold": self.coordinator.thresholds[self.entity_description.key][1]
+        }
+
+    @property
+    def is_on(self):
+        """Return True if the metric is over its limit."""
+        return self.coordinator.threshold_states.get(
+            (self._system_id, self.entity_description.key)
+        )
+
+
+class BeszelHubAlertBinarySensor(BeszelSystemBinarySensor):
+    """Mirror of an alert configured on the Beszel Hub."""
+
+    _attr_device_class = BinarySensorDeviceClass.PROBLEM
+    _attr_icon = "mdi:bell-alert"
+    _data_sections = ("alerts",)
+
+    def __init__(self, coordinator, system_id, system_name, alert_name):
+        """Initialize the hub alert binary sensor."""
+        super().__init__(coordinator, system_id, system_name)
+        self._alert_name = alert_name
+        self._attr_name = f"Hub Alert {alert_name}"
+        self._attr_unique_id = f"{DOMAIN}_{system_id}_alert_{alert_name}"
+
+    @property
+    def _alert(self):
+        """Return this alert's entry, if the hub still has it."""
+        system_data = self.coordinator.data.get(self._system_id, {})
+        return system_data.get("alerts", {}).get(self._alert_name)
+
+    @property
+    def extra_state_attributes(self):
+        """Return the threshold configured on the hub."""
+        alert = self._alert
+        return {"threshold": alert.get("value")} if alert else None
+
+    @property
+    def is_on(self):
+        """Return True if the hub reports the alert as triggered."""
+        alert = self._alert
+        return alert["triggered"] if alert else None
@@ -2,12 +2,47 @@
 
 import logging
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
-from pocketbase.utils import ClientResponseError
+from homeassistant.config_entries import ConfigFlow, ConfigFlowResult, OptionsFlow
+from homeassistant.core import callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import voluptuous as vol
 
-from .api import BeszelApiClient, BeszelApiAuthError
-from .const import DOMAIN
+from .api import BeszelApiClient, BeszelApiAuthError, BeszelApiError
+from .const import (
+    AVERAGED_STATS_TYPES,
+    CONF_AVERAGED_STATS_TYPE,
+    CONF_ENABLE_CONTAINERS,
+    CONF_ENABLE_EXTRA_FS,
+    CONF_ENABLE_GPU,
+    CONF_ENABLE_INFO,
+    CONF_ENABLE_TEMPERATURES,
+    CONF_EXCLUDE_SYSTEMS,
+    CONF_HISTORY_SIZE,
+    CONF_INCLUDE_STATUSES,
+    CONF_INCLUDE_SYSTEMS,
+    CONF_MAX_CONCURRENT_REQUESTS,
+    CONF_MIRROR_ALERTS,
+    CONF_REALTIME,
+    CONF_REQUEST_TIMEOUT,
+    CONF_REQUESTS_PER_SECOND,
+    CONF_THRESHOLD_HYSTERESIS,
+    CONF_UPDATE_INTERVAL,
+    DEFAULT_AVERAGED_STATS_TYPE,
+    DEFAULT_ENABLE_CONTAINERS,
+    DEFAULT_ENABLE_GROUP,
+    DEFAULT_HISTORY_SIZE,
+    DEFAULT_MAX_CONCURRENT_REQUESTS,
+    DEFAULT_MIRROR_ALERTS,
+    DEFAULT_REALTIME,
+    DEFAULT_REQUEST_TIMEOUT_SECONDS,
+    DEFAULT_REQUESTS_PER_SECOND,
+    DEFAULT_THRESHOLD_HYSTERESIS,
+    DEFAULT_UPDATE_INTERVAL_SECONDS,
+    DOMAIN,
+    SYSTEM_STATUSES,
+    THRESHOLD_OPTIONS,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,6 +60,12 @@ class BeszelConfigFlow(ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Return the options flow handler."""
+        return BeszelOptionsFlow()
+
     async def async_step_user(self, user_input=None):
         """Handle the initial step."""
         errors = {}
@@ -34,11 +75,13 @@ class BeszelConfigFlow(ConfigFlow, domain=DOMAIN):
                     user_input["Host"],
                     user_input["Username"],
                     user_input["Password"],
+                    async_get_clientsession(self.hass),
                 )
                 await api_client.async_authenticate()
+                api_client.close()
             except BeszelApiAuthError:
                 errors["base"] = "invalid_auth"
-            except ClientResponseError as exc:
+            except BeszelApiError as exc:
                 _LOGGER.error("PocketBase API error during connection setup: %s", exc)
                 errors["base"] = "cannot_connect"
             except Exception as exc:
@@ -56,3 +99,115 @@ class BeszelConfigFlow(ConfigFlow, domain=DOMAIN):
         return self.async_show_form(
             step_id="user", data_schema=STEP_USER_DATA_SCHEMA, errors=errors
         )
+
+
+class BeszelOptionsFlow(OptionsFlow):
+    """Handle Beszel options."""
+
+    async def async_step_init(self, user_input=None):
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema(
+                {
+                    vol.Optional(
+                        CONF_UPDATE_INTERVAL,
+                        default=options.get(
+                            CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL_SECONDS
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=10, max=3600)),
+                    vol.Optional(
+                        CONF_MAX_CONCURRENT_REQUESTS,
+                        default=options.get(
+                            CONF_MAX_CONCURRENT_REQUESTS,
+                            DEFAULT_MAX_CONCURRENT_REQUESTS,
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=64)),
+                    vol.Optional(
+                        CONF_REQUESTS_PER_SECOND,
+                        default=options.get(
+                            CONF_REQUESTS_PER_SECOND, DEFAULT_REQUESTS_PER_SECOND
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+                    vol.Optional(
+                        CONF_REQUEST_TIMEOUT,
+                        default=options.get(
+                            CONF_REQUEST_TIMEOUT, DEFAULT_REQUEST_TIMEOUT_SECONDS
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=5, max=300)),
+                    vol.Optional(
+                        CONF_HISTORY_SIZE,
+                        default=options.get(CONF_HISTORY_SIZE, DEFAULT_HISTORY_SIZE),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=1440)),
+                    vol.Optional(
+                        CONF_REALTIME,
+                        default=options.get(CONF_REALTIME, DEFAULT_REALTIME),
+                    ): bool,
+                    vol.Optional(
+                        CONF_AVERAGED_STATS_TYPE,
+                        default=options.get(
+                            CONF_AVERAGED_STATS_TYPE, DEFAULT_AVERAGED_STATS_TYPE
+                        ),
+                    ): vol.In(
+                        {
+                            DEFAULT_AVERAGED_STATS_TYPE: "Disabled",
+                            **{
+                                stats_type: f"{stats_type} averages"
+                                for stats_type in AVERAGED_STATS_TYPES
+                            },
+                        }
+                    ),
+                    vol.Optional(
+                        CONF_INCLUDE_SYSTEMS,
+                        default=options.get(CONF_INCLUDE_SYSTEMS, ""),
+                    ): str,
+                    vol.Optional(
+                        CONF_EXCLUDE_SYSTEMS,
+                        default=options.get(CONF_EXCLUDE_SYSTEMS, ""),
+                    ): str,
+                    vol.Optional(
+                        CONF_INCLUDE_STATUSES,
+                        default=options.get(CONF_INCLUDE_STATUSES, []),
+                    ): cv.multi_select(
+                        {status: status.title() for status in SYSTEM_STATUSES}
+                    ),
+                    **{
+                        vol.Optional(
+                            option, default=options.get(option, DEFAULT_ENABLE_GROUP)
+                        ): bool
+                        for option in (
+                            CONF_ENABLE_INFO,
+                            CONF_ENABLE_EXTRA_FS,
+                            CONF_ENABLE_GPU,
+                            CONF_ENABLE_TEMPERATURES,
+                        )
+                    },
+                    vol.Optional(
+                        CONF_ENABLE_CONTAINERS,
+                        default=options.get(
+                            CONF_ENABLE_CONTAINERS, DEFAULT_ENABLE_CONTAINERS
+                        ),
+                    ): bool,
+                    **{
+                        vol.Optional(
+                            option, default=options.get(option, default)
+                        ): vol.All(vol.Coerce(float), vol.Range(min=0, max=150))
+                        for option, (_, _, default) in THRESHOLD_OPTIONS.items()
+                    },
+                    vol.Optional(
+                        CONF_THRESHOLD_HYSTERESIS,
+                        default=options.get(
+                            CONF_THRESHOLD_HYSTERESIS, DEFAULT_THRESHOLD_HYSTERESIS
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0, max=50)),
+                    vol.Optional(
+                        CONF_MIRROR_ALERTS,
+                        default=options.get(CONF_MIRROR_ALERTS, DEFAULT_MIRROR_ALERTS),
+                    ): bool,
+                }
+            ),
+        )
@@ -4,10 +4,115 @@ from homeassistant.const import Platform
 
 DOMAIN = "beszel"
 
-PLATFORMS = [Platform.SENSOR]
+PLATFORMS = [Platform.BINARY_SENSOR, Platform.SENSOR]
 
 DEFAULT_UPDATE_INTERVAL_SECONDS = 60
 
+# System statuses reported by the hub
+SYSTEM_STATUSES = ("up", "down", "paused", "pending")
+
+# Adaptive per-system polling
+ADAPTIVE_SLOW_MULTIPLIER = 5
+ADAPTIVE_SLOW_STATUSES = ("down", "paused")
+ADAPTIVE_VOLATILE_CPU_DELTA = 10
+AGENT_REPORT_INTERVAL_SECONDS = 60
+
+# Systems whose entities are built per event loop iteration during setup
+ENTITY_SETUP_CHUNK_SIZE = 25
+
+# Number of systems listed in the hub's top CPU and disk attributes
+HUB_TOP_N = 5
+
+# Coordinator data sections tracked for change detection
+DIGEST_SECTIONS = (
+    "alerts",
+    "averaged",
+    "containers",
+    "error",
+    "info",
+    "name",
+    "stats",
+    "status",
+)
+
+# Options flow keys
+CONF_AVERAGED_STATS_TYPE = "Averaged Stats Type"
+CONF_CPU_THRESHOLD = "CPU Alert Threshold"
+CONF_DISK_THRESHOLD = "Disk Alert Threshold"
+CONF_ENABLE_CONTAINERS = "Container Sensors"
+CONF_ENABLE_EXTRA_FS = "Extra Filesystem Sensors"
+CONF_ENABLE_GPU = "GPU Sensors"
+CONF_ENABLE_INFO = "System Info Sensors"
+CONF_ENABLE_TEMPERATURES = "Temperature Sensors"
+CONF_EXCLUDE_SYSTEMS = "Exclude Systems"
+CONF_HISTORY_SIZE = "History Samples"
+CONF_INCLUDE_SYSTEMS = "Include Systems"
+CONF_INCLUDE_STATUSES = "Include Statuses"
+CONF_MAX_CONCURRENT_REQUESTS = "Max Concurrent Requests"
+CONF_MEMORY_THRESHOLD = "Memory Alert Threshold"
+CONF_MIRROR_ALERTS = "Mirror Hub Alerts"
+CONF_REALTIME = "Realtime Updates"
+CONF_REQUEST_TIMEOUT = "Request Timeout"
+CONF_REQUESTS_PER_SECOND = "Requests Per Second"
+CONF_TEMPERATURE_THRESHOLD = "Temperature Alert Threshold"
+CONF_THRESHOLD_HYSTERESIS = "Alert Hysteresis"
+CONF_UPDATE_INTERVAL = "Update Interval"
+
+DEFAULT_AVERAGED_STATS_TYPE = "none"
+DEFAULT_ENABLE_CONTAINERS = False
+DEFAULT_ENABLE_GROUP = True
+DEFAULT_HISTORY_SIZE = 60
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+DEFAULT_MIRROR_ALERTS = False
+DEFAULT_REALTIME = False
+DEFAULT_REQUEST_TIMEOUT_SECONDS = 30
+DEFAULT_REQUESTS_PER_SECOND = 10.0
+DEFAULT_THRESHOLD_HYSTERESIS = 5.0
+
+# Event fired when a system crosses a configured threshold
+EVENT_THRESHOLD = "beszel_threshold"
+
+# Finest system_stats resolution recorded by the hub
+STATS_TYPE_LATEST = "1m"
+
+# Coarser pre-aggregated system_stats types and how often each is recorded
+AVERAGED_STATS_TYPES = {
+    "10m": 600,
+    "20m": 1200,
+    "120m": 7200,
+    "480m": 28800,
+}
+
+# Batched system_stats retrieval
+STATS_BATCH_CHUNK_SIZE = 50
+STATS_BATCH_LOOKBACK_SECONDS = 120
+
+# HTTP client settings
+LIST_PAGE_SIZE = 500
+
+# Record fields requested from the hub
+SYSTEM_FIELDS = "id,name,status,info,updated"
+SYSTEM_STATS_FIELDS = "system,type,stats"
+ALERT_FIELDS = "system,name,triggered,value"
+
+# Upper bounds of the request latency histogram buckets
+LATENCY_BUCKETS_SECONDS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# On-disk snapshot of the last coordinator data
+STORAGE_SAVE_DELAY_SECONDS = 30
+STORAGE_VERSION = 1
+
+# Renew the auth token this long before it expires
+TOKEN_RENEW_MARGIN_SECONDS = 300
+
+# Realtime subscriptions
+REALTIME_COLLECTIONS = ("systems", "system_stats")
+REALTIME_BACKOFF_MAX_SECONDS = 300
+REALTIME_BACKOFF_MIN_SECONDS = 5
+REALTIME_DEBOUNCE_SECONDS = 1
+REALTIME_READ_TIMEOUT_SECONDS = 360
+REALTIME_RESYNC_INTERVAL_SECONDS = 900
+
 # Time constants for uptime calculations
 SECONDS_PER_MINUTE = 60
 SECONDS_PER_HOUR = 3600
@@ -22,6 +127,21 @@ ATTR_UPTIME = "u"
 ATTR_AGENT_VERSION = "v"
 ATTR_OS = "os"
 
+# OS type codes from Beszel API (SystemInfo)
+OS_TYPE_ICONS = {
+    0: "mdi:linux",
+    1: "mdi:apple",
+    2: "mdi:microsoft-windows",
+    3: "mdi:freebsd",
+}
+
+OS_TYPE_NAMES = {
+    0: "Linux",
+    1: "Darwin (macOS)",
+    2: "Windows",
+    3: "FreeBSD",
+}
+
 # Attribute names from Beszel API (SystemStats)
 ATTR_CPU_PERCENT = "cpu"
 ATTR_MEM_TOTAL_GB = "m"
@@ -43,6 +163,13 @@ ATTR_TEMPERATURES = "t"
 ATTR_EXTRA_FS = "efs"
 ATTR_GPU_DATA = "g"
 
+# Options toggling the nested stats groups, and the stats key each one covers
+STATS_GROUP_OPTIONS = {
+    CONF_ENABLE_EXTRA_FS: ATTR_EXTRA_FS,
+    CONF_ENABLE_GPU: ATTR_GPU_DATA,
+    CONF_ENABLE_TEMPERATURES: ATTR_TEMPERATURES,
+}
+
 # For GPUData
 ATTR_GPU_NAME = "n"
 ATTR_GPU_MEM_USED_MB = "mu"
@@ -50,9 +177,35 @@ ATTR_GPU_MEM_TOTAL_MB = "mt"
 ATTR_GPU_USAGE_PERCENT = "u"
 ATTR_GPU_POWER_W = "p"
 
+# Metrics with a local history of recent samples, besides temperatures
+HISTORY_STATS_KEYS = (
+    ATTR_CPU_PERCENT,
+    ATTR_MEM_PERCENT,
+    ATTR_DISK_READ_PS_MB,
+    ATTR_DISK_WRITE_PS_MB,
+    ATTR_NET_SENT_PS_MB,
+    ATTR_NET_RECV_PS_MB,
+)
+HISTORY_GPU_KEYS = (ATTR_GPU_USAGE_PERCENT, ATTR_GPU_POWER_W)
+
+# Threshold options: metric name, stats key and default limit (0 disables)
+THRESHOLD_OPTIONS = {
+    CONF_CPU_THRESHOLD: ("cpu", ATTR_CPU_PERCENT, 0.0),
+    CONF_MEMORY_THRESHOLD: ("memory", ATTR_MEM_PERCENT, 0.0),
+    CONF_DISK_THRESHOLD: ("disk", ATTR_DISK_PERCENT, 0.0),
+    CONF_TEMPERATURE_THRESHOLD: ("temperature", ATTR_TEMPERATURES, 0.0),
+}
+
 # For ExtraFsStats
 ATTR_FS_DISK_TOTAL_GB = "d"
 ATTR_FS_DISK_USED_GB = "du"
 ATTR_FS_DISK_PERCENT = "dp"
 ATTR_FS_DISK_READ_PS_MB = "r"
 ATTR_FS_DISK_WRITE_PS_MB = "w"
+
+# For ContainerStats
+ATTR_CONTAINER_NAME = "n"
+ATTR_CONTAINER_CPU_PERCENT = "c"
+ATTR_CONTAINER_MEM_MB = "m"
+ATTR_CONTAINER_NET_SENT_PS_MB = "ns"
+ATTR_CONTAINER_NET_RECV_PS_MB = "nr"
@@ -1,75 +1,705 @@
 """DataUpdateCoordinator for the Beszel integration."""
 
 import asyncio
+import heapq
+import json
 import logging
+import math
+import time
+from array import array
+from collections import Counter
 from datetime import timedelta
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.event import async_call_later, async_track_time_interval
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .api import BeszelApiClient, BeszelApiAuthError
-from .const import DOMAIN
+from .api import (
+    BeszelApiClient,
+    BeszelApiAuthError,
+    BeszelApiError,
+    build_systems_filter,
+    system_matches,
+)
+from .const import (
+    ADAPTIVE_SLOW_MULTIPLIER,
+    ADAPTIVE_SLOW_STATUSES,
+    ADAPTIVE_VOLATILE_CPU_DELTA,
+    AGENT_REPORT_INTERVAL_SECONDS,
+    ATTR_AGENT_VERSION,
+    ATTR_CONTAINER_NAME,
+    ATTR_CPU_PERCENT,
+    ATTR_DISK_PERCENT,
+    ATTR_DISK_USED_GB,
+    ATTR_GPU_DATA,
+    ATTR_MEM_PERCENT,
+    ATTR_MEM_USED_GB,
+    ATTR_NET_RECV_PS_MB,
+    ATTR_NET_SENT_PS_MB,
+    ATTR_OS,
+    ATTR_TEMPERATURES,
+    AVERAGED_STATS_TYPES,
+    DIGEST_SECTIONS,
+    DOMAIN,
+    EVENT_THRESHOLD,
+    HISTORY_GPU_KEYS,
+    HISTORY_STATS_KEYS,
+    HUB_TOP_N,
+    OS_TYPE_NAMES,
+    REALTIME_BACKOFF_MAX_SECONDS,
+    REALTIME_BACKOFF_MIN_SECONDS,
+    REALTIME_COLLECTIONS,
+    REALTIME_DEBOUNCE_SECONDS,
+    REALTIME_RESYNC_INTERVAL_SECONDS,
+    STATS_BATCH_LOOKBACK_SECONDS,
+    STATS_TYPE_LATEST,
+    STORAGE_SAVE_DELAY_SECONDS,
+    STORAGE_VERSION,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _as_float(value):
+    """Return a stats value as a float, treating anything non-numeric as 0."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class BeszelMetricHistory:
+    """Fixed-size ring buffer of the most recent samples of one metric."""
+
+    def __init__(self, size):
+        """Allocate room for `size` samples up front."""
+        self._count = 0
+        self._index = 0
+        self._samples = array("d", bytes(8 * size))
+        self._summary = None
+
+    def append(self, value):
+        """Add a sample, overwriting the oldest one once the buffer is full."""
+        self._samples[self._index] = value
+        self._index = (self._index + 1) % len(self._samples)
+        self._count = min(self._count + 1, len(self._samples))
+        self._summary = None
+
+    def summary(self):
+        """Return min, max, mean and 95th percentile of the held samples."""
+        if self._summary is None and self._count:
+            values = sorted(self._samples[: self._count])
+            self._summary = {
+                "min": round(values[0], 2),
+                "max": round(values[-1], 2),
+                "mean": round(math.fsum(values) / self._count, 2),
+                "p95": round(values[math.ceil(0.95 * self._count) - 1], 2),
+                "samples": self._count,
+            }
+        return self._summary
+
+
 class BeszelDataUpdateCoordinator(DataUpdateCoordinator):
     """Manages fetching data from the Beszel API."""
 
-    def __init__(self, hass, api_client, update_interval_seconds):
-        """Initialize the data update coordinator."""
+    def __init__(
+        self,
+        hass,
+        config_entry,
+        api_client,
+        update_interval_seconds,
+        disabled_stats_keys=frozenset(),
+        systems_filter=None,
+        system_patterns=((), ()),
+        include_statuses=frozenset(),
+        history_size=0,
+        averaged_stats_type=None,
+        containers_enabled=False,
+        thresholds=None,
+        threshold_hysteresis=0,
+        alerts_enabled=False,
+    ):
+        """Initialize the data update coordinator.
+
+        The coordinator ticks faster than the configured interval so that
+        busy systems can be polled sooner; each tick only fetches the
+        systems that are due.
+        """
         super().__init__(
             hass,
             _LOGGER,
+            config_entry=config_entry,
             name=DOMAIN,
-            update_interval=timedelta(seconds=update_interval_seconds),
         )
+        self.alerts_enabled = alerts_enabled
         self.api_client = api_client
-        self.systems_list = []
+        self.averaged_stats_type = averaged_stats_type
+        self.containers_enabled = containers_enabled
+        self.disabled_stats_keys = disabled_stats_keys
+        self.history = {}
+        self.history_size = history_size
+        self.include_statuses = include_statuses
+        self.system_patterns = system_patterns
+        self.systems_filter = systems_filter
+        self.threshold_hysteresis = threshold_hysteresis
+        self.threshold_states = {}
+        self.thresholds = thresholds or {}
+        self._averaged_stats = {}
+        self._hub_alerts = {}
+        self._max_refresh_seconds = 0.0
+        self._refresh_requests = 0
+        self._refresh_seconds = 0.0
+        self._refreshes = 0
+        self._last_poll = None
+        self._next_due = {}
+        self._known_system_ids = None
+        self._realtime_connected = False
+        self._realtime_events = {}
+        self._realtime_flush = None
+        self._realtime_resync = None
+        self._section_digests = {}
+        self._section_values = {}
+        self._system_updated = {}
+        self.changed_sections = {}
+        self.device_infos = {}
+        self.hub_aggregates = {}
+        self.metrics = {}
+        self.setup_timings = {}
+        self.system_failures = Counter()
+        self.hub_device_info = DeviceInfo(
+            identifiers={(DOMAIN, self.hub_identifier)},
+            entry_type=DeviceEntryType.SERVICE,
+            manufacturer="Beszel",
+            model="Hub",
+            name="Beszel Hub",
+        )
+        self.systems_by_id = {}
+        self._store = Store(hass, STORAGE_VERSION, f"{DOMAIN}.{config_entry.entry_id}")
+        self.set_update_interval(update_interval_seconds)
+
+    @property
+    def hub_identifier(self):
+        """Return the device identifier of the hub itself."""
+        return f"hub_{self.config_entry.entry_id}"
+
+    def set_update_interval(self, update_interval_seconds):
+        """Apply a new base polling interval, taking effect from the next tick."""
+        self._base_interval_seconds = update_interval_seconds
+        self._fast_interval_seconds = min(
+            update_interval_seconds,
+            max(update_interval_seconds / 2, AGENT_REPORT_INTERVAL_SECONDS),
+        )
+        self._polling_interval = timedelta(seconds=self._fast_interval_seconds)
+        if not self._realtime_connected:
+            self.update_interval = self._polling_interval
+
+    @callback
+    def async_update_listeners(self):
+        """Record which data sections changed, then notify listeners."""
+        self._update_section_digests()
+        self._evaluate_thresholds()
+        self._update_history()
+        self._update_hub_aggregates()
+        self._update_device_infos()
+        self._remove_stale_devices()
+        self._update_metrics()
+        if self.last_update_success and self.data is not None:
+            self._store.async_delay_save(
+                self._encode_snapshot, STORAGE_SAVE_DELAY_SECONDS
+            )
+        super().async_update_listeners()
+
+    def _update_metrics(self):
+        """Collect the client and refresh instrumentation into one snapshot."""
+        api_metrics = self.api_client.metrics
+        self.metrics = {
+            "auth_renewals": api_metrics.auth_renewals,
+            "bytes_received": api_metrics.bytes_received,
+            "endpoints": {
+                endpoint: {
+                    **stats,
+                    "mean_seconds": round(
+                        stats["total_seconds"] / stats["requests"], 4
+                    ),
+                }
+                for endpoint, stats in api_metrics.endpoints.items()
+            },
+            "last_refresh_requests": self._refresh_requests,
+            "last_refresh_seconds": round(self._refresh_seconds, 3),
+            "max_refresh_seconds": round(self._max_refresh_seconds, 3),
+            "mean_latency_ms": (
+                round(api_metrics.latency_seconds / api_metrics.requests * 1000, 1)
+                if api_metrics.requests
+                else None
+            ),
+            "refreshes": self._refreshes,
+            "request_failures": api_metrics.failures,
+            "requests": api_metrics.requests,
+            "system_failures": {
+                self.systems_by_id.get(system_id, {}).get("name", system_id): count
+                for system_id, count in self.system_failures.items()
+            },
+            "system_failures_total": sum(self.system_failures.values()),
+        }
+
+    def _encode_snapshot(self):
+        """Encode the current data compactly for storage.
+
+        Systems in error keep their error with the name, info and status of
+        their record, so their devices survive a restart. The id is only
+        kept as the key and empty sections are dropped.
+        """
+        snapshot = {}
+        for system_id, system_data in (self.data or {}).items():
+            if "error" in system_data:
+                system = self.systems_by_id.get(system_id, {})
+                system_data = {
+                    "error": system_data["error"],
+                    "info": system.get("info"),
+                    "name": system.get("name"),
+                    "status": system.get("status"),
+                }
+            snapshot[system_id] = {
+                section: value
+                for section, value in system_data.items()
+                if section != "id" and value not in (None, {}, [])
+            }
+        return snapshot
+
+    async def async_save_snapshot(self):
+        """Save the snapshot now, replacing any pending delayed save."""
+        if self.data is not None:
+            await self._store.async_save(self._encode_snapshot())
+
+    async def async_load_snapshot(self):
+        """Restore the data saved by a previous run, returning True if there was any."""
+        snapshot = await self._store.async_load()
+        if not snapshot:
+            return False
+
+        data = {
+            system_id: {
+                "alerts": {},
+                "averaged": {},
+                "containers": {},
+                "id": system_id,
+                "info": {},
+                "name": system_id,
+                "stats": {},
+                "status": "unknown",
+                **sections,
+            }
+            for system_id, sections in snapshot.items()
+        }
+        for system_data in data.values():
+            system_data["stats"] = self._filter_stats(system_data["stats"])
+        self.systems_by_id = {
+            system_id: {
+                "id": system_id,
+                "info": system_data["info"],
+                "name": system_data["name"],
+                "status": system_data["status"],
+            }
+            for system_id, system_data in data.items()
+        }
+        for system_id, system_data in data.items():
+            if "error" in system_data:
+                data[system_id] = {"error": system_data["error"]}
+        self.async_set_updated_data(data)
+        return True
+
+    def set_history_size(self, history_size):
+        """Apply a new history length, discarding the samples held so far."""
+        if history_size != self.history_size:
+            self.history = {}
+            self.history_size = history_size
+
+    def history_summary(self, system_id, path):
+        """Return the summary of a metric's recent samples, if any were kept."""
+        history = self.history.get(system_id, {}).get(path)
+        return history.summary() if history else None
+
+    def _evaluate_thresholds(self):
+        """Check each configured limit for systems with new stats.
+
+        A limit is crossed when the value reaches it and only clears once the
+        value falls below it by the hysteresis margin. Transitions fire a
+        `beszel_threshold` event; the first evaluation only records the state.
+        """
+        if not self.thresholds:
+            return
+        for system_id, system_data in (self.data or {}).items():
+            if "error" in system_data or not self.section_changed(system_id, "stats"):
+                continue
+            stats = system_data.get("stats", {})
+            for metric, (stats_key, limit) in self.thresholds.items():
+                if stats_key == ATTR_TEMPERATURES:
+                    temperatures = stats.get(ATTR_TEMPERATURES)
+                    if not temperatures:
+                        continue
+                    value = max(map(_as_float, temperatures.values()))
+                elif stats.get(stats_key) is None:
+                    continue
+                else:
+                    value = _as_float(stats[stats_key])
+
+                key = (system_id, metric)
+                previous = self.threshold_states.get(key)
+                if previous:
+                    active = value > limit - self.threshold_hysteresis
+                else:
+                    active = value >= limit
+                self.threshold_states[key] = active
+                if previous is None or active == previous:
+                    continue
+                self.hass.bus.async_fire(
+                    EVENT_THRESHOLD,
+                    {
+                        "metric": metric,
+                        "state": "on" if active else "off",
+                        "system_id": system_id,
+                        "system_name": system_data.get("name", system_id),
+                        "threshold": limit,
+                        "value": value,
+                    },
+                )
+
+    def _update_history(self):
+        """Record a sample of each tracked metric for systems with new stats."""
+        if not self.history_size:
+            return
+        for system_id, system_data in (self.data or {}).items():
+            if "error" in system_data or not self.section_changed(system_id, "stats"):
+                continue
+            stats = system_data.get("stats", {})
+            samples = [((key,), stats.get(key)) for key in HISTORY_STATS_KEYS]
+            samples.extend(
+                ((ATTR_TEMPERATURES, name), value)
+                for name, value in stats.get(ATTR_TEMPERATURES, {}).items()
+            )
+            for gpu_id, gpu_stats in stats.get(ATTR_GPU_DATA, {}).items():
+                samples.extend(
+                    ((ATTR_GPU_DATA, gpu_id, key), gpu_stats.get(key))
+                    for key in HISTORY_GPU_KEYS
+                )
+
+            histories = self.history.setdefault(system_id, {})
+            for path, value in samples:
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    continue
+                history = histories.get(path)
+                if history is None:
+                    history = histories[path] = BeszelMetricHistory(self.history_size)
+                history.append(value)
+
+    def _update_hub_aggregates(self):
+        """Compute fleet-wide aggregates in one columnar pass over the systems.
+
+        Each metric is gathered into its own array, and the aggregates are
+        then reduced per column. Skipped when no system changed.
+        """
+        data = self.data or {}
+        if (
+            self.hub_aggregates
+            and set(data) == self._known_system_ids
+            and not any(self.changed_sections.values())
+        ):
+            return
+
+        statuses = Counter()
+        names = []
+        cpu = array("d")
+        memory_percent = array("d")
+        memory_used = array("d")
+        disk_percent = array("d")
+        disk_used = array("d")
+        network_sent = array("d")
+        network_received = array("d")
+        temperature_max = None
+        for system_id, system_data in data.items():
+            if "error" in system_data:
+                continue
+            status = system_data.get("status")
+            statuses[status] += 1
+            stats = system_data.get("stats")
+            if status != "up" or not stats:
+                continue
+            names.append(system_data.get("name", system_id))
+            cpu.append(_as_float(stats.get(ATTR_CPU_PERCENT)))
+            memory_percent.append(_as_float(stats.get(ATTR_MEM_PERCENT)))
+            memory_used.append(_as_float(stats.get(ATTR_MEM_USED_GB)))
+            disk_percent.append(_as_float(stats.get(ATTR_DISK_PERCENT)))
+            disk_used.append(_as_float(stats.get(ATTR_DISK_USED_GB)))
+            network_sent.append(_as_float(stats.get(ATTR_NET_SENT_PS_MB)))
+            network_received.append(_as_float(stats.get(ATTR_NET_RECV_PS_MB)))
+            temperatures = stats.get(ATTR_TEMPERATURES)
+            if temperatures:
+                system_max = max(map(_as_float, temperatures.values()))
+                if temperature_max is None or system_max > temperature_max:
+                    temperature_max = system_max
+
+        count = len(names)
+
+        def mean(column):
+            return round(math.fsum(column) / count, 2) if count else None
+
+        def top(column):
+            return {
+                names[index]: round(column[index], 2)
+                for index in heapq.nlargest(
+                    HUB_TOP_N, range(count), key=column.__getitem__
+                )
+            }
+
+        self.hub_aggregates = {
+            "cpu_mean": mean(cpu),
+            "cpu_top": top(cpu),
+            "disk_mean": mean(disk_percent),
+            "disk_top": top(disk_percent),
+            "disk_used": round(math.fsum(disk_used), 2),
+            "memory_mean": mean(memory_percent),
+            "memory_used": round(math.fsum(memory_used), 2),
+            "network_received": round(math.fsum(network_received), 2),
+            "network_sent": round(math.fsum(network_sent), 2),
+            "systems_down": statuses["down"],
+            "systems_paused": statuses["paused"],
+            "systems_up": statuses["up"],
+            "temperature_max": (
+                round(temperature_max, 1) if temperature_max is not None else None
+            ),
+        }
+
+    def _update_device_infos(self):
+        """Refresh the shared per-system device info from changed system data.
+
+        Entities reference these objects directly; agent version and OS
+        changes are pushed to the device registry once per system.
+        """
+        device_registry = None
+        for system_id, system_data in (self.data or {}).items():
+            if "error" in system_data:
+                continue
+            previous = self.device_infos.get(system_id)
+            if (
+                previous is not None
+                and not self.section_changed(system_id, "info")
+                and not self.section_changed(system_id, "name")
+            ):
+                continue
+
+            info = system_data.get("info", {})
+            device_info = DeviceInfo(
+                identifiers={(DOMAIN, system_id)},
+                manufacturer="Beszel",
+                model=OS_TYPE_NAMES.get(info.get(ATTR_OS), "Monitored System"),
+                name=system_data.get("name", system_id),
+                sw_version=info.get(ATTR_AGENT_VERSION) or "Unknown",
+            )
+            self.device_infos[system_id] = device_info
+            if previous is None or (
+                previous["model"] == device_info["model"]
+                and previous["sw_version"] == device_info["sw_version"]
+            ):
+                continue
+
+            device_registry = device_registry or dr.async_get(self.hass)
+            device = device_registry.async_get_device(identifiers={(DOMAIN, system_id)})
+            if device:
+                device_registry.async_update_device(
+                    device.id,
+                    model=device_info["model"],
+                    sw_version=device_info["sw_version"],
+                )
+
+    def _remove_stale_devices(self):
+        """Remove devices, and with them entities, of systems deleted from the hub."""
+        system_ids = set(self.data or {})
+        if system_ids == self._known_system_ids:
+            return
+        self._known_system_ids = system_ids
+        for system_id in set(self.device_infos) - system_ids:
+            del self.device_infos[system_id]
+        for system_id in set(self.history) - system_ids:
+            del self.history[system_id]
+        for system_id in set(self.system_failures) - system_ids:
+            del self.system_failures[system_id]
+        for key in [key for key in self.threshold_states if key[0] not in system_ids]:
+            del self.threshold_states[key]
+
+        device_registry = dr.async_get(self.hass)
+        for device in dr.async_entries_for_config_entry(
+            device_registry, self.config_entry.entry_id
+        ):
+            if not any(
+                domain == DOMAIN
+                and (identifier in system_ids or identifier == self.hub_identifier)
+                for domain, identifier in device.identifiers
+            ):
+                _LOGGER.debug("Removing device %s for deleted system", device.name)
+                device_registry.async_update_device(
+                    device.id, remove_config_entry_id=self.config_entry.entry_id
+                )
+
+    def _update_section_digests(self):
+        """Digest each system's data sections and note the ones that changed.
+
+        Sections carried forward from the previous refresh are the same
+        objects, so they are recognised without being hashed again.
+        """
+        digests = {}
+        values = {}
+        changed = {}
+        for system_id, system_data in (self.data or {}).items():
+            previous_digests = self._section_digests.get(system_id, {})
+            previous_values = self._section_values.get(system_id, {})
+            digests[system_id] = {}
+            values[system_id] = {}
+            changed[system_id] = set()
+            for section in DIGEST_SECTIONS:
+                value = system_data.get(section)
+                if section in previous_values and value is previous_values[section]:
+                    digest = previous_digests[section]
+                else:
+                    digest = hash(json.dumps(value, sort_keys=True, default=str))
+                if digest != previous_digests.get(section):
+                    changed[system_id].add(section)
+                digests[system_id][section] = digest
+                values[system_id][section] = value
+
+        self._section_digests = digests
+        self._section_values = values
+        self.changed_sections = changed
+
+    def section_changed(self, system_id, section):
+        """Return True if a system's data section changed in the last update."""
+        return section in self.changed_sections.get(system_id, (section,))
 
     async def _async_update_data(self):
-        """Fetch data from API endpoint."""
+        """Fetch data from API endpoint, recording the refresh's cost."""
+        started = time.monotonic()
+        requests = self.api_client.metrics.requests
         try:
-            await self.api_client.async_authenticate()
+            return await self._async_fetch_data()
+        finally:
+            self._refresh_seconds = time.monotonic() - started
+            self._max_refresh_seconds = max(
+                self._max_refresh_seconds, self._refresh_seconds
+            )
+            self._refresh_requests = self.api_client.metrics.requests - requests
+            self._refreshes += 1
 
-            self.systems_list = await self.api_client.async_get_systems()
-            if not self.systems_list:
+    async def _async_fetch_data(self):
+        """Fetch data from API endpoint."""
+        try:
+            self.systems_by_id = {
+                system["id"]: system
+                for system in await self.api_client.async_get_systems(
+                    self.systems_filter
+                )
+                if system.get("id") and system_matches(system, *self.system_patterns)
+            }
+            if not self.systems_by_id:
                 _LOGGER.info("No systems found.")
                 return {}
 
-            all_system_data = {}
-            tasks = []
-            for system in self.systems_list:
-                system_id = system.get("id")
-                if not system_id:
-                    continue
-
-                tasks.append(
-                    self._fetch_individual_system_data(
-                        system_id, system.get("name", system_id)
-                    )
+            previous_data = self.data or {}
+            changed_ids = {
+                system_id
+                for system_id, system in self.systems_by_id.items()
+                if not self._is_unchanged(system, previous_data.get(system_id))
+            }
+            now = time.monotonic()
+            due_before = now + self._fast_interval_seconds / 2
+            due_ids = [
+                system_id
+                for system_id in changed_ids
+                if self._status_selected(self.systems_by_id[system_id])
+                and (
+                    system_id not in previous_data
+                    or self._next_due.get(system_id, 0) <= due_before
                 )
+            ]
 
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+            poll_started = dt_util.utcnow()
+            latest_stats = {}
+            latest_containers = {}
+            if due_ids:
+                latest_stats, latest_containers = await asyncio.gather(
+                    self._fetch_latest_stats(due_ids),
+                    self._fetch_latest_containers(due_ids),
+                )
+            self._last_poll = poll_started
 
-            for i, system in enumerate(self.systems_list):
-                system_id = system.get("id")
-                if not system_id:
+            all_system_data = {}
+            system_updated = {}
+            next_due = {}
+            for system_id, system in self.systems_by_id.items():
+                if system_id not in latest_stats:
+                    # Not due yet, or filtered out by its status: refresh info
+                    # and status from the systems record and keep the stats.
+                    # Due systems are fetched when their turn comes; systems
+                    # filtered by status stay known but are not fetched.
+                    selected = self._status_selected(system)
+                    previous_system_data = previous_data.get(system_id, {})
+                    if system_id in changed_ids and (
+                        "stats" in previous_system_data or not selected
+                    ):
+                        all_system_data[system_id] = self._build_system_data(
+                            system,
+                            previous_system_data.get("stats"),
+                            previous_system_data.get("containers"),
+                        )
+                    else:
+                        all_system_data[system_id] = previous_system_data
+                    if selected:
+                        system_updated[system_id] = self._system_updated.get(system_id)
+                    else:
+                        system_updated[system_id] = system.get("updated")
+                    if system_id in self._next_due:
+                        next_due[system_id] = self._next_due[system_id]
                     continue
 
-                result = results[i]
+                result = latest_stats[system_id]
                 if isinstance(result, Exception):
                     _LOGGER.error(
                         "Error fetching data for system %s: %s", system_id, result
                     )
                     all_system_data[system_id] = {"error": str(result)}
-                elif result:
-                    all_system_data[system_id] = result
+                    self.system_failures[system_id] += 1
                 else:
-                    all_system_data[system_id] = {
-                        "error": "Unknown error fetching data for system"
-                    }
+                    if latest_containers is None:
+                        containers = previous_data.get(system_id, {}).get("containers")
+                    else:
+                        containers = latest_containers.get(system_id)
+                    all_system_data[system_id] = self._build_system_data(
+                        system, result, containers
+                    )
+                    system_updated[system_id] = system.get("updated")
+                    next_due[system_id] = now + self._next_poll_delay(
+                        system,
+                        previous_data.get(system_id, {}).get("stats"),
+                        all_system_data[system_id]["stats"],
+                    )
+
+            self._next_due = next_due
+            self._system_updated = system_updated
 
+            # The averages are fetched on their own timer and only merged here
+            if self.averaged_stats_type:
+                all_system_data = self._with_section(
+                    all_system_data, "averaged", self._averaged_stats
+                )
+            if self.alerts_enabled:
+                await self._fetch_hub_alerts()
+                all_system_data = self._with_section(
+                    all_system_data, "alerts", self._hub_alerts
+                )
             return all_system_data
 
         except BeszelApiAuthError as err:
@@ -77,23 +707,398 @@ class BeszelDataUpdateCoordinator(DataUpdateCoordinator):
         except Exception as err:
             raise UpdateFailed(f"Error communicating with API: {err}") from err
 
-    async def _fetch_individual_system_data(self, system_id, system_name):
-        """Fetch stats and 'info' for a single system."""
-        stats = await self.api_client.async_get_latest_system_stats(system_id)
+    def _status_selected(self, system):
+        """Return True if a system's current status passes the status filter."""
+        return (
+            not self.include_statuses or system.get("status") in self.include_statuses
+        )
+
+    def _next_poll_delay(self, system, previous_stats, stats):
+        """Return how long to wait before fetching a system's stats again.
+
+        Down, paused and idle systems back off; systems whose CPU load is
+        swinging are polled at the fast interval.
+        """
+        if system.get("status") in ADAPTIVE_SLOW_STATUSES or previous_stats == stats:
+            return self._base_interval_seconds * ADAPTIVE_SLOW_MULTIPLIER
+        if previous_stats:
+            try:
+                cpu_delta = abs(
+                    float(stats.get(ATTR_CPU_PERCENT, 0))
+                    - float(previous_stats.get(ATTR_CPU_PERCENT, 0))
+                )
+            except (TypeError, ValueError):
+                cpu_delta = 0
+            if cpu_delta >= ADAPTIVE_VOLATILE_CPU_DELTA:
+                return self._fast_interval_seconds
+        return self._base_interval_seconds
+
+    def _is_unchanged(self, system, previous_system_data):
+        """Return True if a system's record has not moved since the last poll."""
+        return (
+            previous_system_data is not None
+            and "error" not in previous_system_data
+            and system.get("updated") is not None
+            and self._system_updated.get(system["id"]) == system.get("updated")
+        )
+
+    async def _fetch_latest_stats(self, system_ids):
+        """Fetch the latest stats for the given systems in as few requests as possible.
 
-        system_record = next(
-            (s for s in self.systems_list if s.get("id") == system_id), None
+        The batch window is computed from the local clock while the hub
+        stamps records with its own, so the systems a skewed window missed
+        fall back to an individual fetch rather than keeping stale stats.
+        """
+        since = (
+            self._last_poll or dt_util.utcnow() - self.update_interval
+        ) - timedelta(seconds=STATS_BATCH_LOOKBACK_SECONDS)
+        latest_stats = await self.api_client.async_get_latest_system_stats_batch(
+            system_ids, since
         )
-        device_info_summary = {}
-        if system_record:
-            device_info_summary = system_record.get("info", {})
 
+        missing_ids = [
+            system_id for system_id in system_ids if system_id not in latest_stats
+        ]
+        if missing_ids:
+            _LOGGER.debug(
+                "No stats since %s for %d systems, fetching individually",
+                since,
+                len(missing_ids),
+            )
+
+        results = await asyncio.gather(
+            *(
+                self.api_client.async_get_latest_system_stats(system_id)
+                for system_id in missing_ids
+            ),
+            return_exceptions=True,
+        )
+        latest_stats.update(zip(missing_ids, results))
+        return latest_stats
+
+    @staticmethod
+    def _with_section(all_system_data, section, values):
+        """Return the system data with one section replaced from per-system values."""
+        return {
+            system_id: (
+                system_data
+                if "error" in system_data
+                else {**system_data, section: values.get(system_id, {})}
+            )
+            for system_id, system_data in all_system_data.items()
+        }
+
+    async def _fetch_hub_alerts(self):
+        """Fetch the hub's alerts, keeping the previous ones if the fetch fails."""
+        try:
+            alerts = await self.api_client.async_get_alerts()
+        except BeszelApiError as err:
+            _LOGGER.warning("Error fetching hub alerts: %s", err)
+            return
+
+        hub_alerts = {}
+        for alert in alerts:
+            if alert.get("system") in self.systems_by_id and alert.get("name"):
+                hub_alerts.setdefault(alert["system"], {})[alert["name"]] = (
+                    self._alert_entry(alert)
+                )
+        self._hub_alerts = hub_alerts
+
+    @staticmethod
+    def _alert_entry(alert):
+        """Reduce an alert record to its triggered state and threshold."""
+        return {"triggered": bool(alert.get("triggered")), "value": alert.get("value")}
+
+    @callback
+    def async_track_averaged_stats(self):
+        """Refresh the averaged stats every aggregation interval.
+
+        The timer is independent of polling, so the averages keep updating
+        while realtime pushes replace the poll. Returns the unsubscribe
+        callback.
+        """
+        return async_track_time_interval(
+            self.hass,
+            self.async_refresh_averaged_stats,
+            timedelta(seconds=AVERAGED_STATS_TYPES[self.averaged_stats_type]),
+        )
+
+    async def async_refresh_averaged_stats(self, _now=None):
+        """Fetch the averaged stats and push them to the entities.
+
+        The data is replaced without `async_set_updated_data`, which would
+        postpone the next poll.
+        """
+        if not await self._fetch_averaged_stats() or self.data is None:
+            return
+        data = self._with_section(self.data, "averaged", self._averaged_stats)
+        if data != self.data:
+            self.data = data
+            self.async_update_listeners()
+
+    async def _fetch_averaged_stats(self):
+        """Fetch the latest pre-aggregated stats of the selected systems.
+
+        Systems without a new record keep their previous averages. A failed
+        fetch is logged and retried on the next tick; returns True on success.
+        """
+        interval_seconds = AVERAGED_STATS_TYPES[self.averaged_stats_type]
+        since = dt_util.utcnow() - timedelta(seconds=2 * interval_seconds)
+        system_ids = [
+            system_id
+            for system_id, system in self.systems_by_id.items()
+            if self._status_selected(system)
+        ]
+        if not system_ids:
+            return False
+        try:
+            latest_stats = await self.api_client.async_get_latest_system_stats_batch(
+                system_ids, since, self.averaged_stats_type
+            )
+        except BeszelApiError as err:
+            _LOGGER.warning("Error fetching averaged stats: %s", err)
+            return False
+
+        self._averaged_stats = {
+            system_id: (
+                self._filter_stats(latest_stats[system_id])
+                if system_id in latest_stats
+                else self._averaged_stats[system_id]
+            )
+            for system_id in self.systems_by_id
+            if system_id in latest_stats or system_id in self._averaged_stats
+        }
+        return True
+
+    def _filter_stats(self, stats):
+        """Drop the stats groups disabled in the options."""
+        if not stats or not self.disabled_stats_keys.intersection(stats):
+            return stats or {}
+        return {
+            key: value
+            for key, value in stats.items()
+            if key not in self.disabled_stats_keys
+        }
+
+    async def _fetch_latest_containers(self, system_ids):
+        """Fetch the latest container snapshot of the given systems in one query.
+
+        Systems without a snapshot in the window have no running containers.
+        Returns None if the fetch failed, so previous snapshots are kept.
+        """
+        if not self.containers_enabled:
+            return {}
+        since = (
+            self._last_poll or dt_util.utcnow() - self.update_interval
+        ) - timedelta(seconds=STATS_BATCH_LOOKBACK_SECONDS)
+        try:
+            latest = await self.api_client.async_get_latest_container_stats_batch(
+                system_ids, since
+            )
+        except BeszelApiError as err:
+            _LOGGER.warning("Error fetching container stats: %s", err)
+            return None
+        return {
+            system_id: self._index_containers(containers)
+            for system_id, containers in latest.items()
+        }
+
+    @staticmethod
+    def _index_containers(containers):
+        """Key a container stats list by container name."""
+        return {
+            container[ATTR_CONTAINER_NAME]: container
+            for container in containers or ()
+            if isinstance(container, dict) and container.get(ATTR_CONTAINER_NAME)
+        }
+
+    def _build_system_data(self, system_record, stats, containers=None):
+        """Combine stats, containers and 'info' for a single system record."""
+        system_id = system_record["id"]
         return {
+            "alerts": self._hub_alerts.get(system_id, {}),
+            "averaged": self._averaged_stats.get(system_id, {}),
+            "containers": containers or {},
             "id": system_id,
-            "info": device_info_summary,
-            "name": system_name,
-            "stats": stats or {},
-            "status": (
-                system_record.get("status", "unknown") if system_record else "unknown"
-            ),
+            "info": system_record.get("info", {}),
+            "name": system_record.get("name", system_id),
+            "stats": self._filter_stats(stats),
+            "status": system_record.get("status", "unknown"),
         }
+
+    async def async_run_realtime(self):
+        """Keep a realtime subscription open, reconnecting with backoff.
+
+        While the stream is connected, polling is replaced by an occasional
+        resync on its own timer; when it drops, the regular polling interval
+        is restored.
+        """
+        backoff = REALTIME_BACKOFF_MIN_SECONDS
+        try:
+            while True:
+                collections = REALTIME_COLLECTIONS
+                if self.alerts_enabled:
+                    collections = (*collections, "alerts")
+                if self.containers_enabled:
+                    collections = (*collections, "container_stats")
+                stats_filter = self._realtime_stats_filter()
+                try:
+                    await self.api_client.async_listen_realtime(
+                        collections,
+                        self._handle_realtime_connect,
+                        self._handle_realtime_event,
+                        {
+                            "container_stats": stats_filter,
+                            "systems": self.systems_filter,
+                            "system_stats": stats_filter,
+                        },
+                    )
+                except BeszelApiError as err:
+                    _LOGGER.warning("Realtime stream unavailable: %s", err)
+
+                if self._realtime_connected:
+                    self._realtime_connected = False
+                    self._stop_realtime_resync()
+                    self.update_interval = self._polling_interval
+                    backoff = REALTIME_BACKOFF_MIN_SECONDS
+                    await self.async_request_refresh()
+
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, REALTIME_BACKOFF_MAX_SECONDS)
+        finally:
+            self._stop_realtime_resync()
+            if self._realtime_flush is not None:
+                self._realtime_flush()
+                self._realtime_flush = None
+            self._realtime_events = {}
+
+    def _realtime_stats_filter(self):
+        """Return the filter for stats subscriptions of the selected systems.
+
+        The system patterns and statuses are matched through the stats
+        record's system relation, so excluded hosts are not streamed.
+        """
+        terms = [f'type="{STATS_TYPE_LATEST}"']
+        systems_filter = build_systems_filter(
+            *self.system_patterns, sorted(self.include_statuses), relation="system"
+        )
+        if systems_filter:
+            terms.append(f"({systems_filter})")
+        return " && ".join(terms)
+
+    def _stop_realtime_resync(self):
+        """Cancel the resync timer that runs while the stream is connected."""
+        if self._realtime_resync is not None:
+            self._realtime_resync()
+            self._realtime_resync = None
+
+    @callback
+    def _handle_realtime_connect(self):
+        """Switch from polling to push once the subscription is active.
+
+        Pushed updates reschedule the coordinator's own timer, so the resync
+        runs on a separate one that they cannot postpone.
+        """
+        _LOGGER.debug("Realtime stream connected")
+        self._realtime_connected = True
+        self.update_interval = None
+        self._stop_realtime_resync()
+        self._realtime_resync = async_track_time_interval(
+            self.hass,
+            self._async_realtime_resync,
+            timedelta(seconds=REALTIME_RESYNC_INTERVAL_SECONDS),
+        )
+
+    async def _async_realtime_resync(self, _now):
+        """Refresh everything from the hub to catch up on missed events."""
+        await self.async_refresh()
+
+    @callback
+    def _handle_realtime_event(self, collection, action, record):
+        """Queue a realtime record event for the next batched update.
+
+        Only the newest event per record, or per system for stats, is kept
+        until the debounce window closes.
+        """
+        if self.data is None:
+            return
+
+        if collection in ("container_stats", "system_stats"):
+            if record.get("type") != STATS_TYPE_LATEST:
+                return
+            key = record.get("system")
+        elif collection == "alerts":
+            key = (record.get("system"), record.get("name"))
+        else:
+            key = record.get("id")
+        if not key:
+            return
+
+        self._realtime_events[(collection, key)] = (action, record)
+        if self._realtime_flush is None:
+            self._realtime_flush = async_call_later(
+                self.hass, REALTIME_DEBOUNCE_SECONDS, self._flush_realtime_events
+            )
+
+    @callback
+    def _flush_realtime_events(self, _now):
+        """Apply the queued realtime events in a single coordinator update."""
+        self._realtime_flush = None
+        events, self._realtime_events = self._realtime_events, {}
+        if self.data is None:
+            return
+
+        data = dict(self.data)
+        for (collection, _), (action, record) in events.items():
+            if collection == "alerts":
+                self._apply_alert_event(data, action, record)
+            elif collection in ("container_stats", "system_stats"):
+                self._apply_stats_event(data, collection, record)
+            else:
+                self._apply_system_event(data, action, record)
+        if data != self.data:
+            self.async_set_updated_data(data)
+
+    def _apply_alert_event(self, data, action, record):
+        """Merge a realtime alert event into the data being built."""
+        system_id = record.get("system")
+        current = data.get(system_id)
+        if not current or "error" in current or not record.get("name"):
+            return
+        alerts = dict(self._hub_alerts.get(system_id, {}))
+        if action == "delete":
+            alerts.pop(record["name"], None)
+        else:
+            alerts[record["name"]] = self._alert_entry(record)
+        self._hub_alerts[system_id] = alerts
+        data[system_id] = {**current, "alerts": alerts}
+
+    def _apply_stats_event(self, data, collection, record):
+        """Merge a realtime stats or container snapshot into the data being built."""
+        system_id = record.get("system")
+        current = data.get(system_id)
+        if (
+            not current
+            or "error" in current
+            or not self._status_selected(self.systems_by_id.get(system_id, {}))
+        ):
+            return
+        if collection == "container_stats":
+            section = {"containers": self._index_containers(record.get("stats"))}
+        else:
+            section = {"stats": self._filter_stats(record.get("stats"))}
+        data[system_id] = {**current, **section}
+
+    def _apply_system_event(self, data, action, record):
+        """Merge a realtime systems record event into the data being built."""
+        system_id = record["id"]
+        if action == "delete" or not system_matches(record, *self.system_patterns):
+            self.systems_by_id.pop(system_id, None)
+            data.pop(system_id, None)
+            return
+
+        self.systems_by_id[system_id] = record
+        current = data.get(system_id, {})
+        data[system_id] = self._build_system_data(
+            record, current.get("stats"), current.get("containers")
+        )
@@ -0,0 +1,19 @@
+"""Diagnostics support for Beszel."""
+
+from homeassistant.components.diagnostics import async_redact_data
+
+from .const import DOMAIN
+
+TO_REDACT = {"Password", "Username"}
+
+
+async def async_get_config_entry_diagnostics(hass, entry):
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    return {
+        "entry": async_redact_data(entry.data, TO_REDACT),
+        "options": dict(entry.options),
+        "metrics": coordinator.metrics,
+        "setup_timings": coordinator.setup_timings,
+        "systems": len(coordinator.data or {}),
+    }
@@ -0,0 +1,105 @@
+"""Base entity for the Beszel integration."""
+
+import asyncio
+import time
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import ENTITY_SETUP_CHUNK_SIZE
+
+
+async def async_add_system_entities(
+    entry, coordinator, async_add_entities, create_entities, timing_key, prune=None
+):
+    """Add a platform's per-system entities now and whenever new keys appear.
+
+    `create_entities(system_id, system_data, known_keys)` returns the
+    entities for keys not yet in `known_keys` and marks the ones it creates.
+    Keys start with their system id and are dropped with the system; `prune`,
+    if given, is called with the data and keys to drop others. The time spent
+    on the initial entities is recorded under `timing_key`.
+    """
+    known_keys = set()
+
+    @callback
+    def _async_add_new_entities():
+        """Add entities for systems and items that appeared since the last refresh."""
+        data = coordinator.data or {}
+        known_keys.difference_update([key for key in known_keys if key[0] not in data])
+        if prune is not None:
+            prune(data, known_keys)
+
+        entities_to_add = []
+        for system_id, system_data in data.items():
+            if "error" not in system_data:
+                entities_to_add.extend(
+                    create_entities(system_id, system_data, known_keys)
+                )
+
+        if entities_to_add:
+            async_add_entities(entities_to_add)
+
+    started = time.monotonic()
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_new_entities))
+
+    # Build the initial entities a chunk of systems at a time, yielding to
+    # the event loop in between so large fleets do not block it.
+    systems = [
+        (system_id, system_data)
+        for system_id, system_data in (coordinator.data or {}).items()
+        if "error" not in system_data
+    ]
+    for start in range(0, len(systems), ENTITY_SETUP_CHUNK_SIZE):
+        entities_to_add = []
+        for system_id, system_data in systems[start : start + ENTITY_SETUP_CHUNK_SIZE]:
+            entities_to_add.extend(create_entities(system_id, system_data, known_keys))
+        if entities_to_add:
+            async_add_entities(entities_to_add)
+        await asyncio.sleep(0)
+    coordinator.setup_timings[timing_key] = time.monotonic() - started
+
+
+class BeszelCoordinatorEntity(CoordinatorEntity):
+    """Coordinator entity that only writes state when its output changes."""
+
+    _data_sections = ("stats",)
+    _history_path = None
+    _last_written_state = None
+    _unrecorded_attributes = frozenset({"min", "max", "mean", "p95", "samples"})
+
+    @property
+    def extra_state_attributes(self):
+        """Return the summary of this metric's recent samples."""
+        if self._history_path is None:
+            return None
+        return self.coordinator.history_summary(self._system_id, self._history_path)
+
+    def _state_values(self):
+        """Return the platform-specific values that make up the written state."""
+        return (self.native_value, self.native_unit_of_measurement)
+
+    @callback
+    def _handle_coordinator_update(self):
+        """Write state only if the resolved value or attributes changed."""
+        sections_changed = any(
+            self.coordinator.section_changed(self._system_id, section)
+            for section in ("error", *self._data_sections)
+        )
+        if (
+            not sections_changed
+            and self._last_written_state is not None
+            and self._last_written_state[0] == self.available
+        ):
+            return
+
+        state = (
+            self.available,
+            *self._state_values(),
+            self.icon,
+            self.extra_state_attributes,
+        )
+        if state == self._last_written_state:
+            return
+        self._last_written_state = state
+        super()._handle_coordinator_update()
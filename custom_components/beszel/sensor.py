@@ -1,25 +1,35 @@
 """Sensor platform for Beszel."""
 
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from functools import partial
 import logging
+from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.const import (
+    MATCH_ALL,
     PERCENTAGE,
+    EntityCategory,
     UnitOfDataRate,
     UnitOfInformation,
     UnitOfPower,
     UnitOfTemperature,
     UnitOfTime,
 )
-from homeassistant.core import callback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.helpers import entity_registry as er
 
 from .const import (
     ATTR_AGENT_VERSION,
+    ATTR_CONTAINER_CPU_PERCENT,
+    ATTR_CONTAINER_MEM_MB,
+    ATTR_CONTAINER_NET_RECV_PS_MB,
+    ATTR_CONTAINER_NET_SENT_PS_MB,
     ATTR_CORES,
     ATTR_CPU_MODEL,
     ATTR_CPU_PERCENT,
@@ -55,509 +65,856 @@ from .const import (
     ATTR_TEMPERATURES,
     ATTR_THREADS,
     ATTR_UPTIME,
+    CONF_ENABLE_INFO,
+    DEFAULT_ENABLE_GROUP,
     DOMAIN,
+    HISTORY_GPU_KEYS,
+    HISTORY_STATS_KEYS,
+    OS_TYPE_ICONS,
+    OS_TYPE_NAMES,
     SECONDS_PER_DAY,
     SECONDS_PER_HOUR,
     SECONDS_PER_MINUTE,
 )
 from .coordinator import BeszelDataUpdateCoordinator
+from .entity import BeszelCoordinatorEntity, async_add_system_entities
 
-SENSOR_TYPES_INFO = [
-    (
-        ATTR_AGENT_VERSION,
-        "Agent Version",
-        None,
-        None,
-        None,
-        "mdi:information-outline",
-        "info",
-        True,
-    ),
-    (ATTR_CORES, "CPU Cores", None, None, None, "mdi:cpu-64-bit", "info", True),
-    (ATTR_CPU_MODEL, "CPU Model", None, None, None, "mdi:cpu-64-bit", "info", True),
-    (ATTR_KERNEL_VERSION, "Kernel Version", None, None, None, "mdi:chip", "info", True),
-    (ATTR_OS, "Operating System", None, None, None, "mdi:linux", "info", True),
-    (ATTR_THREADS, "CPU Threads", None, None, None, "mdi:cpu-64-bit", "info", True),
-    (
-        ATTR_UPTIME,
-        "Uptime",
-        None,
-        None,
-        SensorStateClass.MEASUREMENT,
-        "mdi:timer-sand",
-        "info",
-        True,
-    ),
-]
-
-SENSOR_TYPES_STATS = [
-    (
-        ATTR_CPU_PERCENT,
-        "CPU Usage",
-        PERCENTAGE,
-        SensorDeviceClass.POWER_FACTOR,
-        SensorStateClass.MEASUREMENT,
-        "mdi:cpu-64-bit",
-        "stats",
-        True,
-    ),
-    (
-        ATTR_DISK_PERCENT,
-        "Disk Usage",
-        PERCENTAGE,
-        SensorDeviceClass.POWER_FACTOR,
-        SensorStateClass.MEASUREMENT,
-        "mdi:harddisk",
-        "stats",
-        True,
-    ),
-    (
-        ATTR_DISK_READ_PS_MB,
-        "Disk Read Speed",
-        UnitOfDataRate.MEGABYTES_PER_SECOND,
-        SensorDeviceClass.DATA_RATE,
-        SensorStateClass.MEASUREMENT,
-        "mdi:arrow-down-bold-circle-outline",
-        "stats",
-        True,
-    ),
-    (
-        ATTR_DISK_TOTAL_GB,
-        "Disk Total",
-        UnitOfInformation.GIGABYTES,
-        SensorDeviceClass.DATA_SIZE,
-        SensorStateClass.MEASUREMENT,
-        "mdi:harddisk",
-        "stats",
-        True,
-    ),
-    (
-        ATTR_DISK_USED_GB,
-        "Disk Used",
-        UnitOfInformation.GIGABYTES,
-        SensorDeviceClass.DATA_SIZE,
-        SensorStateClass.MEASUREMENT,
-        "mdi:harddisk",
-        "stats",
-        True,
-    ),
-    (
-        ATTR_DISK_WRITE_PS_MB,
-        "Disk Write Speed",
-        UnitOfDataRate.MEGABYTES_PER_SECOND,
-        SensorDeviceClass.DATA_RATE,
-        SensorStateClass.MEASUREMENT,
-        "mdi:arrow-up-bold-circle-outline",
-        "stats",
-        True,
-    ),
-    (
-        ATTR_MEM_BUFF_CACHE_GB,
-        "Memory Buffer/Cache",
-        UnitOfInformation.GIGABYTES,
-        SensorDeviceClass.DATA_SIZE,
-        SensorStateClass.MEASUREMENT,
-        "mdi:memory",
-        "stats",
-        True,
-    ),
-    (
-        ATTR_MEM_PERCENT,
-        "Memory Usage",
-        PERCENTAGE,
-        SensorDeviceClass.POWER_FACTOR,
-        SensorStateClass.MEASUREMENT,
-        "mdi:memory",
-        "stats",
-        True,
-    ),
-    (
-        ATTR_MEM_TOTAL_GB,
-        "Memory Total",
-        UnitOfInformation.GIGABYTES,
-        SensorDeviceClass.DATA_SIZE,
-        SensorStateClass.MEASUREMENT,
-        "mdi:memory",
-        "stats",
-        True,
-    ),
-    (
-        ATTR_MEM_USED_GB,
-        "Memory Used",
-        UnitOfInformation.GIGABYTES,
-        SensorDeviceClass.DATA_SIZE,
-        SensorStateClass.MEASUREMENT,
-        "mdi:memory",
-        "stats",
-        True,
-    ),
-    (
-        ATTR_MEM_ZFS_ARC_GB,
-        "Memory ZFS ARC",
-        UnitOfInformation.GIGABYTES,
-        SensorDeviceClass.DATA_SIZE,
-        SensorStateClass.MEASUREMENT,
-        "mdi:memory",
-        "stats",
-        True,
-    ),
-    (
-        ATTR_NET_RECV_PS_MB,
-        "Network Received Speed",
-        UnitOfDataRate.MEGABYTES_PER_SECOND,
-        SensorDeviceClass.DATA_RATE,
-        SensorStateClass.MEASUREMENT,
-        "mdi:download-network-outline",
-        "stats",
-        True,
-    ),
-    (
-        ATTR_NET_SENT_PS_MB,
-        "Network Sent Speed",
-        UnitOfDataRate.MEGABYTES_PER_SECOND,
-        SensorDeviceClass.DATA_RATE,
-        SensorStateClass.MEASUREMENT,
-        "mdi:upload-network-outline",
-        "stats",
-        True,
-    ),
-    (
-        ATTR_SWAP_PERCENT,
-        "Swap Usage",
-        PERCENTAGE,
-        SensorDeviceClass.POWER_FACTOR,
-        SensorStateClass.MEASUREMENT,
-        "mdi:harddisk",
-        "stats",
-        True,
-        None,
-        lambda data: (
-            round(
-                (data.get(ATTR_SWAP_USED_GB, 0) / data.get(ATTR_SWAP_TOTAL_GB, 1))
-                * 100,
-                2,
-            )
-            if data.get(ATTR_SWAP_TOTAL_GB)
-            else 0
-        ),
+
+@dataclass(frozen=True, kw_only=True)
+class BeszelSensorEntityDescription(SensorEntityDescription):
+    """Describes a Beszel sensor.
+
+    `name_template` is formatted with the item name (filesystem, GPU or
+    container) when a nested sensor is constructed. `attributes_key` names a
+    hub aggregate exposed as the sensor's attributes.
+    """
+
+    attributes_key: str | None = None
+    data_source_key: str = "stats"
+    name_template: str | None = None
+    value_func: Callable[[dict], Any] | None = None
+
+
+def _swap_percent(data):
+    """Calculate swap usage percent from used and total swap."""
+    if not data.get(ATTR_SWAP_TOTAL_GB):
+        return 0
+    return round((data.get(ATTR_SWAP_USED_GB, 0) / data[ATTR_SWAP_TOTAL_GB]) * 100, 2)
+
+
+def _fs_percent(data):
+    """Calculate filesystem usage percent from used and total space."""
+    if not data.get(ATTR_FS_DISK_TOTAL_GB):
+        return 0
+    return round(
+        (data.get(ATTR_FS_DISK_USED_GB, 0) / data[ATTR_FS_DISK_TOTAL_GB]) * 100, 2
+    )
+
+
+SENSOR_TYPES_INFO = (
+    BeszelSensorEntityDescription(
+        key=ATTR_AGENT_VERSION,
+        name="Agent Version",
+        icon="mdi:information-outline",
+        data_source_key="info",
     ),
-    (
-        ATTR_SWAP_TOTAL_GB,
-        "Swap Total",
-        UnitOfInformation.GIGABYTES,
-        SensorDeviceClass.DATA_SIZE,
-        SensorStateClass.MEASUREMENT,
-        "mdi:harddisk",
-        "stats",
-        True,
-    ),
-    (
-        ATTR_SWAP_USED_GB,
-        "Swap Used",
-        UnitOfInformation.GIGABYTES,
-        SensorDeviceClass.DATA_SIZE,
-        SensorStateClass.MEASUREMENT,
-        "mdi:harddisk",
-        "stats",
-        True,
-    ),
-    (
-        "status",
-        "Status",
-        None,
-        SensorDeviceClass.ENUM,
-        None,
-        "mdi:server-network",
-        "status",
-        True,
-        ["Down", "Paused", "Pending", "Unknown", "Up"],
-    ),
-]
-
-
-def _create_extra_fs_sensors(coordinator, system_id, system_name, fs_name):
-    """Helper to create sensors for an extra filesystem."""
-    fs_sensor_types = [
-        (
-            ATTR_FS_DISK_PERCENT,
-            f"{fs_name} Usage",
-            PERCENTAGE,
-            SensorDeviceClass.POWER_FACTOR,
-            SensorStateClass.MEASUREMENT,
-            "mdi:harddisk",
-            True,
-            lambda data: (
-                round(
-                    (
-                        data.get(ATTR_FS_DISK_USED_GB, 0)
-                        / data.get(ATTR_FS_DISK_TOTAL_GB, 1)
-                    )
-                    * 100,
-                    2,
-                )
-                if data.get(ATTR_FS_DISK_TOTAL_GB)
-                else 0
-            ),
-        ),
-        (
-            ATTR_FS_DISK_READ_PS_MB,
-            f"{fs_name} Read Speed",
-            UnitOfDataRate.MEGABYTES_PER_SECOND,
-            SensorDeviceClass.DATA_RATE,
-            SensorStateClass.MEASUREMENT,
-            "mdi:arrow-down-bold-circle-outline",
-            True,
-        ),
-        (
-            ATTR_FS_DISK_TOTAL_GB,
-            f"{fs_name} Total",
-            UnitOfInformation.GIGABYTES,
-            SensorDeviceClass.DATA_SIZE,
-            SensorStateClass.MEASUREMENT,
-            "mdi:harddisk",
-            True,
-        ),
-        (
-            ATTR_FS_DISK_USED_GB,
-            f"{fs_name} Used",
-            UnitOfInformation.GIGABYTES,
-            SensorDeviceClass.DATA_SIZE,
-            SensorStateClass.MEASUREMENT,
-            "mdi:harddisk",
-            True,
+    BeszelSensorEntityDescription(
+        key=ATTR_CORES, name="CPU Cores", icon="mdi:cpu-64-bit", data_source_key="info"
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_CPU_MODEL,
+        name="CPU Model",
+        icon="mdi:cpu-64-bit",
+        data_source_key="info",
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_KERNEL_VERSION,
+        name="Kernel Version",
+        icon="mdi:chip",
+        data_source_key="info",
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_OS, name="Operating System", icon="mdi:linux", data_source_key="info"
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_THREADS,
+        name="CPU Threads",
+        icon="mdi:cpu-64-bit",
+        data_source_key="info",
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_UPTIME,
+        name="Uptime",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:timer-sand",
+        data_source_key="info",
+    ),
+)
+
+SENSOR_TYPES_STATS = (
+    BeszelSensorEntityDescription(
+        key=ATTR_CPU_PERCENT,
+        name="CPU Usage",
+        native_unit_of_measurement=PERCENTAGE,
+        device_class=SensorDeviceClass.POWER_FACTOR,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:cpu-64-bit",
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_DISK_PERCENT,
+        name="Disk Usage",
+        native_unit_of_measurement=PERCENTAGE,
+        device_class=SensorDeviceClass.POWER_FACTOR,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:harddisk",
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_DISK_READ_PS_MB,
+        name="Disk Read Speed",
+        native_unit_of_measurement=UnitOfDataRate.MEGABYTES_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:arrow-down-bold-circle-outline",
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_DISK_TOTAL_GB,
+        name="Disk Total",
+        native_unit_of_measurement=UnitOfInformation.GIGABYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:harddisk",
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_DISK_USED_GB,
+        name="Disk Used",
+        native_unit_of_measurement=UnitOfInformation.GIGABYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:harddisk",
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_DISK_WRITE_PS_MB,
+        name="Disk Write Speed",
+        native_unit_of_measurement=UnitOfDataRate.MEGABYTES_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:arrow-up-bold-circle-outline",
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_MEM_BUFF_CACHE_GB,
+        name="Memory Buffer/Cache",
+        native_unit_of_measurement=UnitOfInformation.GIGABYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:memory",
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_MEM_PERCENT,
+        name="Memory Usage",
+        native_unit_of_measurement=PERCENTAGE,
+        device_class=SensorDeviceClass.POWER_FACTOR,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:memory",
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_MEM_TOTAL_GB,
+        name="Memory Total",
+        native_unit_of_measurement=UnitOfInformation.GIGABYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:memory",
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_MEM_USED_GB,
+        name="Memory Used",
+        native_unit_of_measurement=UnitOfInformation.GIGABYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:memory",
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_MEM_ZFS_ARC_GB,
+        name="Memory ZFS ARC",
+        native_unit_of_measurement=UnitOfInformation.GIGABYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:memory",
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_NET_RECV_PS_MB,
+        name="Network Received Speed",
+        native_unit_of_measurement=UnitOfDataRate.MEGABYTES_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:download-network-outline",
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_NET_SENT_PS_MB,
+        name="Network Sent Speed",
+        native_unit_of_measurement=UnitOfDataRate.MEGABYTES_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:upload-network-outline",
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_SWAP_PERCENT,
+        name="Swap Usage",
+        native_unit_of_measurement=PERCENTAGE,
+        device_class=SensorDeviceClass.POWER_FACTOR,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:harddisk",
+        value_func=_swap_percent,
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_SWAP_TOTAL_GB,
+        name="Swap Total",
+        native_unit_of_measurement=UnitOfInformation.GIGABYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:harddisk",
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_SWAP_USED_GB,
+        name="Swap Used",
+        native_unit_of_measurement=UnitOfInformation.GIGABYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:harddisk",
+    ),
+    BeszelSensorEntityDescription(
+        key="status",
+        name="Status",
+        device_class=SensorDeviceClass.ENUM,
+        icon="mdi:server-network",
+        options=["Down", "Paused", "Pending", "Unknown", "Up"],
+        data_source_key="status",
+    ),
+)
+
+# Averages of the fluctuating metrics, read from pre-aggregated stats records
+SENSOR_TYPES_AVERAGED = tuple(
+    replace(
+        description,
+        data_source_key="averaged",
+        name=f"{description.name} Average",
+    )
+    for description in SENSOR_TYPES_STATS
+    if description.key in HISTORY_STATS_KEYS
+)
+
+SENSOR_TYPES_EXTRA_FS = (
+    BeszelSensorEntityDescription(
+        key=ATTR_FS_DISK_PERCENT,
+        name_template="{} Usage",
+        native_unit_of_measurement=PERCENTAGE,
+        device_class=SensorDeviceClass.POWER_FACTOR,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:harddisk",
+        value_func=_fs_percent,
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_FS_DISK_READ_PS_MB,
+        name_template="{} Read Speed",
+        native_unit_of_measurement=UnitOfDataRate.MEGABYTES_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:arrow-down-bold-circle-outline",
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_FS_DISK_TOTAL_GB,
+        name_template="{} Total",
+        native_unit_of_measurement=UnitOfInformation.GIGABYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:harddisk",
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_FS_DISK_USED_GB,
+        name_template="{} Used",
+        native_unit_of_measurement=UnitOfInformation.GIGABYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:harddisk",
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_FS_DISK_WRITE_PS_MB,
+        name_template="{} Write Speed",
+        native_unit_of_measurement=UnitOfDataRate.MEGABYTES_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:arrow-up-bold-circle-outline",
+    ),
+)
+
+SENSOR_TYPES_GPU = (
+    BeszelSensorEntityDescription(
+        key=ATTR_GPU_MEM_TOTAL_MB,
+        name_template="{} Memory Total",
+        native_unit_of_measurement=UnitOfInformation.MEGABYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:memory",
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_GPU_MEM_USED_MB,
+        name_template="{} Memory Used",
+        native_unit_of_measurement=UnitOfInformation.MEGABYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:memory",
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_GPU_POWER_W,
+        name_template="{} Power Draw",
+        native_unit_of_measurement=UnitOfPower.WATT,
+        device_class=SensorDeviceClass.POWER,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:lightning-bolt",
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_GPU_USAGE_PERCENT,
+        name_template="{} Usage",
+        native_unit_of_measurement=PERCENTAGE,
+        device_class=SensorDeviceClass.POWER_FACTOR,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:expansion-card",
+    ),
+)
+
+SENSOR_TYPES_CONTAINER = (
+    BeszelSensorEntityDescription(
+        key=ATTR_CONTAINER_CPU_PERCENT,
+        name_template="{} CPU Usage",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:docker",
+        data_source_key="containers",
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_CONTAINER_MEM_MB,
+        name_template="{} Memory Used",
+        native_unit_of_measurement=UnitOfInformation.MEGABYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:memory",
+        data_source_key="containers",
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_CONTAINER_NET_RECV_PS_MB,
+        name_template="{} Network Received Speed",
+        native_unit_of_measurement=UnitOfDataRate.MEGABYTES_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:arrow-down-bold-circle-outline",
+        data_source_key="containers",
+    ),
+    BeszelSensorEntityDescription(
+        key=ATTR_CONTAINER_NET_SENT_PS_MB,
+        name_template="{} Network Sent Speed",
+        native_unit_of_measurement=UnitOfDataRate.MEGABYTES_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:arrow-up-bold-circle-outline",
+        data_source_key="containers",
+    ),
+)
+
+SENSOR_TYPES_HUB = (
+    BeszelSensorEntityDescription(
+        key="systems_up",
+        name="Systems Up",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:server",
+        data_source_key="hub",
+    ),
+    BeszelSensorEntityDescription(
+        key="systems_down",
+        name="Systems Down",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:server-off",
+        data_source_key="hub",
+    ),
+    BeszelSensorEntityDescription(
+        key="systems_paused",
+        name="Systems Paused",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:server-minus",
+        data_source_key="hub",
+    ),
+    BeszelSensorEntityDescription(
+        key="cpu_mean",
+        name="Mean CPU Usage",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:cpu-64-bit",
+        attributes_key="cpu_top",
+        data_source_key="hub",
+    ),
+    BeszelSensorEntityDescription(
+        key="memory_mean",
+        name="Mean Memory Usage",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:memory",
+        data_source_key="hub",
+    ),
+    BeszelSensorEntityDescription(
+        key="memory_used",
+        name="Total Memory Used",
+        native_unit_of_measurement=UnitOfInformation.GIGABYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:memory",
+        data_source_key="hub",
+    ),
+    BeszelSensorEntityDescription(
+        key="disk_mean",
+        name="Mean Disk Usage",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:harddisk",
+        attributes_key="disk_top",
+        data_source_key="hub",
+    ),
+    BeszelSensorEntityDescription(
+        key="disk_used",
+        name="Total Disk Used",
+        native_unit_of_measurement=UnitOfInformation.GIGABYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:harddisk",
+        data_source_key="hub",
+    ),
+    BeszelSensorEntityDescription(
+        key="network_received",
+        name="Total Network Received Speed",
+        native_unit_of_measurement=UnitOfDataRate.MEGABYTES_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:arrow-down-bold-circle-outline",
+        data_source_key="hub",
+    ),
+    BeszelSensorEntityDescription(
+        key="network_sent",
+        name="Total Network Sent Speed",
+        native_unit_of_measurement=UnitOfDataRate.MEGABYTES_PER_SECOND,
+        device_class=SensorDeviceClass.DATA_RATE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:arrow-up-bold-circle-outline",
+        data_source_key="hub",
+    ),
+    BeszelSensorEntityDescription(
+        key="temperature_max",
+        name="Max Temperature",
+        native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+        device_class=SensorDeviceClass.TEMPERATURE,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:thermometer-high",
+        data_source_key="hub",
+    ),
+)
+
+SENSOR_TYPES_DIAGNOSTIC = (
+    BeszelSensorEntityDescription(
+        key="requests",
+        name="API Requests",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:api",
+        data_source_key="metrics",
+    ),
+    BeszelSensorEntityDescription(
+        key="request_failures",
+        name="API Request Failures",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:api-off",
+        data_source_key="metrics",
+    ),
+    BeszelSensorEntityDescription(
+        key="bytes_received",
+        name="API Bytes Received",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:download-network",
+        data_source_key="metrics",
+    ),
+    BeszelSensorEntityDescription(
+        key="auth_renewals",
+        name="Auth Token Renewals",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:key-change",
+        data_source_key="metrics",
+    ),
+    BeszelSensorEntityDescription(
+        key="last_refresh_seconds",
+        name="Last Refresh Duration",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:timer-outline",
+        data_source_key="metrics",
+    ),
+    BeszelSensorEntityDescription(
+        key="last_refresh_requests",
+        name="Requests Per Refresh",
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:api",
+        data_source_key="metrics",
+    ),
+    BeszelSensorEntityDescription(
+        key="mean_latency_ms",
+        name="Mean Request Latency",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:timer-sand",
+        attributes_key="endpoints",
+        data_source_key="metrics",
+    ),
+    BeszelSensorEntityDescription(
+        key="system_failures_total",
+        name="System Fetch Failures",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:server-remove",
+        attributes_key="system_failures",
+        data_source_key="metrics",
+    ),
+)
+
+SENSOR_TYPE_TEMPERATURE = BeszelSensorEntityDescription(
+    key=ATTR_TEMPERATURES,
+    native_unit_of_measurement=UnitOfTemperature.CELSIUS,
+    device_class=SensorDeviceClass.TEMPERATURE,
+    state_class=SensorStateClass.MEASUREMENT,
+    icon="mdi:thermometer",
+)
+
+
+def _round_value(value, digits):
+    """Round a numeric value, passing through anything non-numeric."""
+    try:
+        return round(float(value), digits)
+    except (ValueError, TypeError):
+        return value
+
+
+def _make_value_converter(api_key, unit, value_func=None):
+    """Build a function reading one value from a dict, selected once per sensor."""
+    if value_func:
+        return value_func
+
+    default = 0.0 if unit == UnitOfDataRate.MEGABYTES_PER_SECOND else None
+    if unit == PERCENTAGE:
+
+        def convert(data_dict):
+            value = data_dict.get(api_key)
+            return default if value is None else _round_value(value, 2)
+
+        return convert
+
+    def convert(data_dict):
+        value = data_dict.get(api_key)
+        return default if value is None else value
+
+    return convert
+
+
+def _make_section_accessor(data_source_key, convert):
+    """Build a function reading a sensor value from a system's data section."""
+
+    def accessor(system_data):
+        data_dict = system_data.get(data_source_key, {})
+        if not isinstance(data_dict, dict):
+            return None
+        return convert(data_dict)
+
+    return accessor
+
+
+def _make_nested_accessor(data_source_key, parent_key, item_key, convert):
+    """Build a function reading a sensor value from a nested item of a section.
+
+    Items live under `parent_key` within the section, or directly in the
+    section when `parent_key` is None.
+    """
+
+    def accessor(system_data):
+        parent_dict = system_data.get(data_source_key, {})
+        if parent_key is not None:
+            parent_dict = parent_dict.get(parent_key, {})
+        return convert(parent_dict.get(item_key, {}))
+
+    return accessor
+
+
+def _nested_unique_id(system_id, parent_key, item_key, description):
+    """Return the unique ID of a nested sensor."""
+    group = parent_key or description.data_source_key
+    return f"{DOMAIN}_{system_id}_stats_{group}_{item_key}_{description.key}"
+
+
+def _read_status(system_data):
+    """Read the capitalized system status."""
+    return system_data.get("status", "unknown").title()
+
+
+def _read_os_name(system_data):
+    """Read the human-readable OS name."""
+    return OS_TYPE_NAMES.get(system_data.get("info", {}).get(ATTR_OS), "Unknown")
+
+
+def _round_temperature(value):
+    """Round a temperature reading, or return None if it is not numeric."""
+    try:
+        return round(float(value), 1)
+    except (ValueError, TypeError):
+        return None
+
+
+def _make_system_accessor(description):
+    """Build the value accessor of a system sensor, selected once per description."""
+    if description.data_source_key == "status":
+        return _read_status
+    if description.data_source_key == "info" and description.key == ATTR_OS:
+        return _read_os_name
+    return _make_section_accessor(
+        description.data_source_key,
+        _make_value_converter(
+            description.key,
+            description.native_unit_of_measurement,
+            description.value_func,
         ),
+    )
+
+
+def _with_accessors(descriptions):
+    """Pair system sensor descriptions with their value accessors."""
+    return tuple(
+        (description, _make_system_accessor(description))
+        for description in descriptions
+    )
+
+
+def _with_converters(descriptions):
+    """Pair nested sensor descriptions with their item value converters."""
+    return tuple(
         (
-            ATTR_FS_DISK_WRITE_PS_MB,
-            f"{fs_name} Write Speed",
-            UnitOfDataRate.MEGABYTES_PER_SECOND,
-            SensorDeviceClass.DATA_RATE,
-            SensorStateClass.MEASUREMENT,
-            "mdi:arrow-up-bold-circle-outline",
-            True,
-        ),
-    ]
+            description,
+            _make_value_converter(
+                description.key,
+                description.native_unit_of_measurement,
+                description.value_func,
+            ),
+        )
+        for description in descriptions
+    )
+
+
+# Descriptions paired with their value readers, so discovery can check for a
+# value before constructing an entity
+_AVERAGED_ACCESSORS = _with_accessors(SENSOR_TYPES_AVERAGED)
+_CONTAINER_CONVERTERS = _with_converters(SENSOR_TYPES_CONTAINER)
+_EXTRA_FS_CONVERTERS = _with_converters(SENSOR_TYPES_EXTRA_FS)
+_GPU_CONVERTERS = _with_converters(SENSOR_TYPES_GPU)
+
+
+def _create_nested_sensors(
+    coordinator,
+    system_id,
+    system_name,
+    parent_key,
+    item_key,
+    item_name,
+    item_data,
+    converters,
+    known_keys,
+):
+    """Helper to create sensors for one extra filesystem, GPU or container.
 
+    A key is only marked known once the item reports a value for it, so
+    sensors for fields it does not report yet are retried on later refreshes.
+    """
     sensors = []
-    for (
-        api_key_suffix,
-        name_suffix_full,
-        unit,
-        dev_class,
-        state_class,
-        icon,
-        enabled,
-        *rest,
-    ) in fs_sensor_types:
-        value_func = rest[0] if rest else None
-        sensor = BeszelNestedSensor(
-            coordinator,
+    for description, convert in converters:
+        key = (
             system_id,
-            system_name,
-            ATTR_EXTRA_FS,
-            fs_name,
-            api_key_suffix,
-            name_suffix_full,
-            unit,
-            dev_class,
-            state_class,
-            icon,
-            enabled,
-            value_func=value_func,
+            parent_key or description.data_source_key,
+            item_key,
+            description.key,
+        )
+        if key in known_keys or convert(item_data) is None:
+            continue
+        known_keys.add(key)
+        sensors.append(
+            BeszelNestedSensor(
+                coordinator,
+                system_id,
+                system_name,
+                parent_key,
+                item_key,
+                item_name,
+                description,
+            )
         )
-        if sensor.native_value is not None:
-            sensors.append(sensor)
     return sensors
 
 
-def _create_gpu_sensors(
-    coordinator, system_id, system_name, gpu_id_key, gpu_name_display
+def _create_new_system_entities(
+    coordinator, system_id, system_data, known_keys, accessors
 ):
-    """Helper to create sensors for a GPU."""
-    gpu_sensor_types = [
-        (
-            ATTR_GPU_MEM_TOTAL_MB,
-            f"{gpu_name_display} Memory Total",
-            UnitOfInformation.MEGABYTES,
-            SensorDeviceClass.DATA_SIZE,
-            SensorStateClass.MEASUREMENT,
-            "mdi:memory",
-            True,
-        ),
-        (
-            ATTR_GPU_MEM_USED_MB,
-            f"{gpu_name_display} Memory Used",
-            UnitOfInformation.MEGABYTES,
-            SensorDeviceClass.DATA_SIZE,
-            SensorStateClass.MEASUREMENT,
-            "mdi:memory",
-            True,
-        ),
-        (
-            ATTR_GPU_POWER_W,
-            f"{gpu_name_display} Power Draw",
-            UnitOfPower.WATT,
-            SensorDeviceClass.POWER,
-            SensorStateClass.MEASUREMENT,
-            "mdi:lightning-bolt",
-            True,
-        ),
-        (
-            ATTR_GPU_USAGE_PERCENT,
-            f"{gpu_name_display} Usage",
-            PERCENTAGE,
-            SensorDeviceClass.POWER_FACTOR,
-            SensorStateClass.MEASUREMENT,
-            "mdi:expansion-card",
-            True,
-        ),
-    ]
+    """Helper to create entities for a system's keys not in known_keys.
+
+    A key is only marked known once the system reports a value for it, so a
+    system that joins with empty stats gains its sensors as soon as they are
+    reported. Values are read through the description's accessor, so no
+    entity is built for keys that are still missing.
+    """
+    entities = []
+    system_name = system_data.get("name", system_id)
+
+    # Add averaged sensors once pre-aggregated stats are available
+    if system_data.get("averaged"):
+        accessors = (*accessors, *_AVERAGED_ACCESSORS)
+    for description, accessor in accessors:
+        key = (system_id, description.data_source_key, description.key)
+        if key in known_keys:
+            continue
+        value = accessor(system_data)
+        if value is None or (isinstance(value, str) and value.lower() == "unknown"):
+            continue
+        known_keys.add(key)
+        entities.append(BeszelSensor(coordinator, system_id, system_name, description))
+
+    # Add Extra Filesystem sensors
+    extra_fs_data = system_data.get("stats", {}).get(ATTR_EXTRA_FS, {})
+    for fs_name, fs_data in extra_fs_data.items():
+        entities.extend(
+            _create_nested_sensors(
+                coordinator,
+                system_id,
+                system_name,
+                ATTR_EXTRA_FS,
+                fs_name,
+                fs_name,
+                fs_data,
+                _EXTRA_FS_CONVERTERS,
+                known_keys,
+            )
+        )
 
-    sensors = []
-    for (
-        api_key_suffix,
-        name_suffix_full,
-        unit,
-        dev_class,
-        state_class,
-        icon,
-        enabled,
-    ) in gpu_sensor_types:
-        sensor = BeszelNestedSensor(
-            coordinator,
-            system_id,
-            system_name,
-            ATTR_GPU_DATA,
-            gpu_id_key,
-            api_key_suffix,
-            name_suffix_full,
-            unit,
-            dev_class,
-            state_class,
-            icon,
-            enabled,
+    # Add GPU sensors
+    gpu_data_map = system_data.get("stats", {}).get(ATTR_GPU_DATA, {})
+    for gpu_id, gpu_stats in gpu_data_map.items():
+        gpu_name_from_stats = gpu_stats.get(ATTR_GPU_NAME, gpu_id)
+        entities.extend(
+            _create_nested_sensors(
+                coordinator,
+                system_id,
+                system_name,
+                ATTR_GPU_DATA,
+                gpu_id,
+                gpu_name_from_stats,
+                gpu_stats,
+                _GPU_CONVERTERS,
+                known_keys,
+            )
+        )
+
+    # Add container sensors
+    for container_name, container in system_data.get("containers", {}).items():
+        entities.extend(
+            _create_nested_sensors(
+                coordinator,
+                system_id,
+                system_name,
+                None,
+                container_name,
+                container_name,
+                container,
+                _CONTAINER_CONVERTERS,
+                known_keys,
+            )
         )
-        if sensor.native_value is not None:
-            sensors.append(sensor)
-    return sensors
+
+    # Add temperature sensors
+    temps = system_data.get("stats", {}).get(ATTR_TEMPERATURES, {})
+    for temp_sensor_name in temps:
+        key = (system_id, ATTR_TEMPERATURES, temp_sensor_name)
+        if key in known_keys or _round_temperature(temps[temp_sensor_name]) is None:
+            continue
+        known_keys.add(key)
+        entities.append(
+            BeszelTemperatureSensor(
+                coordinator, system_id, system_name, temp_sensor_name
+            )
+        )
+
+    return entities
+
+
+def _remove_stopped_containers(hass, data, known_keys):
+    """Remove the entities of containers no longer reported by a running system."""
+    stopped_keys = [
+        key
+        for key in known_keys
+        if len(key) == 4
+        and key[1] == "containers"
+        and data[key[0]].get("status") == "up"
+        and key[2] not in data[key[0]].get("containers", {})
+    ]
+    if not stopped_keys:
+        return
+
+    known_keys.difference_update(stopped_keys)
+    entity_registry = er.async_get(hass)
+    for system_id, container_name in {(key[0], key[2]) for key in stopped_keys}:
+        for description in SENSOR_TYPES_CONTAINER:
+            entity_id = entity_registry.async_get_entity_id(
+                "sensor",
+                DOMAIN,
+                _nested_unique_id(system_id, None, container_name, description),
+            )
+            if entity_id:
+                entity_registry.async_remove(entity_id)
 
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up Beszel sensor entities based on a config entry."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
-    await coordinator.async_config_entry_first_refresh()
-
-    entities_to_add = []
-
-    if coordinator.data:
-        for system_id, system_data in coordinator.data.items():
-            if "error" in system_data:
-                continue
-
-            system_name = system_data.get("name", system_id)
-
-            # Add static info sensors
-            for (
-                api_key,
-                name_suffix,
-                unit,
-                dev_class,
-                state_class,
-                icon,
-                data_key,
-                enabled,
-                *rest,
-            ) in SENSOR_TYPES_INFO:
-                options = rest[0] if rest else None
-                sensor = BeszelSensor(
-                    coordinator,
-                    system_id,
-                    system_name,
-                    api_key,
-                    name_suffix,
-                    unit,
-                    dev_class,
-                    state_class,
-                    icon,
-                    data_key,
-                    enabled,
-                    options=options,
-                )
-                value = sensor.native_value
-                if value is not None and not (
-                    isinstance(value, str) and value.lower() == "unknown"
-                ):
-                    entities_to_add.append(sensor)
-
-            # Add dynamic stats sensors
-            for (
-                api_key,
-                name_suffix,
-                unit,
-                dev_class,
-                state_class,
-                icon,
-                data_key,
-                enabled,
-                *rest,
-            ) in SENSOR_TYPES_STATS:
-                options = rest[0] if rest and len(rest) > 0 else None
-                value_func = rest[1] if rest and len(rest) > 1 else None
-                sensor = BeszelSensor(
-                    coordinator,
-                    system_id,
-                    system_name,
-                    api_key,
-                    name_suffix,
-                    unit,
-                    dev_class,
-                    state_class,
-                    icon,
-                    data_key,
-                    enabled,
-                    options=options,
-                    value_func=value_func,
-                )
-                value = sensor.native_value
-                if value is not None and not (
-                    isinstance(value, str) and value.lower() == "unknown"
-                ):
-                    entities_to_add.append(sensor)
-
-            # Add Extra Filesystem sensors
-            extra_fs_data = system_data.get("stats", {}).get(ATTR_EXTRA_FS, {})
-            for fs_name, fs_stats in extra_fs_data.items():
-                entities_to_add.extend(
-                    _create_extra_fs_sensors(
-                        coordinator, system_id, system_name, fs_name
-                    )
-                )
-
-            # Add GPU sensors
-            gpu_data_map = system_data.get("stats", {}).get(ATTR_GPU_DATA, {})
-            for gpu_id, gpu_stats in gpu_data_map.items():
-                gpu_name_from_stats = gpu_stats.get(ATTR_GPU_NAME, gpu_id)
-                entities_to_add.extend(
-                    _create_gpu_sensors(
-                        coordinator, system_id, system_name, gpu_id, gpu_name_from_stats
-                    )
-                )
-
-            # Add temperature sensors
-            temps = system_data.get("stats", {}).get(ATTR_TEMPERATURES, {})
-            for temp_sensor_name in temps:
-                sensor = BeszelTemperatureSensor(
-                    coordinator, system_id, system_name, temp_sensor_name
-                )
-                if sensor.native_value is not None:
-                    entities_to_add.append(sensor)
-
-    if entities_to_add:
-        async_add_entities(entities_to_add)
-
-
-class BeszelNestedSensor(SensorEntity, CoordinatorEntity):
+
+    descriptions = SENSOR_TYPES_STATS
+    if entry.options.get(CONF_ENABLE_INFO, DEFAULT_ENABLE_GROUP):
+        descriptions = (*SENSOR_TYPES_INFO, *SENSOR_TYPES_STATS)
+    accessors = _with_accessors(descriptions)
+
+    def _create_entities(system_id, system_data, known_keys):
+        """Create the sensors of a system's keys not in known_keys."""
+        return _create_new_system_entities(
+            coordinator, system_id, system_data, known_keys, accessors
+        )
+
+    async_add_entities(
+        BeszelHubSensor(coordinator, description) for description in SENSOR_TYPES_HUB
+    )
+    async_add_entities(
+        BeszelDiagnosticSensor(coordinator, description)
+        for description in SENSOR_TYPES_DIAGNOSTIC
+    )
+    await async_add_system_entities(
+        entry,
+        coordinator,
+        async_add_entities,
+        _create_entities,
+        "sensor_entities",
+        prune=partial(_remove_stopped_containers, hass),
+    )
+
+
+class BeszelNestedSensor(SensorEntity, BeszelCoordinatorEntity):
     """Sensor for values nested within a sub-dictionary (e.g., extra_fs, gpu_data)."""
 
+    _attr_has_entity_name = True
+
     def __init__(
         self,
         coordinator,
@@ -565,41 +922,34 @@ class BeszelNestedSensor(SensorEntity, CoordinatorEntity):
         system_name,
         parent_key,
         item_key,
-        api_value_key,
-        name_full,
-        unit,
-        device_class,
-        state_class,
-        icon,
-        enabled_by_default=True,
-        value_func=None,
+        item_name,
+        description,
     ):
         """Initialize the nested sensor."""
-        CoordinatorEntity.__init__(self, coordinator)
+        BeszelCoordinatorEntity.__init__(self, coordinator)
+        self.entity_description = description
         self._system_id = system_id
         self._system_name = system_name
-        self._attr_device_class = device_class
-        self._attr_entity_registry_enabled_default = enabled_by_default
-        self._attr_name = name_full
-        self._attr_native_unit_of_measurement = unit
-        self._attr_state_class = state_class
-        self._attr_icon = icon
-        self._attr_has_entity_name = True
-
-        unique_part = f"{parent_key}_{item_key}_{api_value_key}"
-        self._attr_unique_id = f"{DOMAIN}_{system_id}_stats_{unique_part}"
-
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, system_id)},
-            "manufacturer": "Beszel",
-            "model": "Monitored System",
-            "name": system_name,
-        }
-
-        self._api_value_key = api_value_key
-        self._item_key = item_key
-        self._parent_key = parent_key
-        self._value_func = value_func
+        self._attr_name = description.name_template.format(item_name)
+        self._attr_unique_id = _nested_unique_id(
+            system_id, parent_key, item_key, description
+        )
+        self._data_sections = (description.data_source_key,)
+
+        self._attr_device_info = coordinator.device_infos.get(system_id)
+        if parent_key == ATTR_GPU_DATA and description.key in HISTORY_GPU_KEYS:
+            self._history_path = (parent_key, item_key, description.key)
+
+        self._value_accessor = _make_nested_accessor(
+            description.data_source_key,
+            parent_key,
+            item_key,
+            _make_value_converter(
+                description.key,
+                description.native_unit_of_measurement,
+                description.value_func,
+            ),
+        )
 
     @property
     def system_data(self):
@@ -609,88 +959,36 @@ class BeszelNestedSensor(SensorEntity, CoordinatorEntity):
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        parent_dict = self.system_data.get("stats", {}).get(self._parent_key, {})
-        item_dict = parent_dict.get(self._item_key, {})
-
-        if self._value_func:
-            return self._value_func(item_dict)
-
-        value = item_dict.get(self._api_value_key)
-
-        if (
-            value is None
-            and self._attr_native_unit_of_measurement
-            == UnitOfDataRate.MEGABYTES_PER_SECOND
-        ):
-            value = 0.0
-
-        if value is not None and self._attr_native_unit_of_measurement == PERCENTAGE:
-            try:
-                return round(float(value), 2)
-            except (ValueError, TypeError):
-                return value
-        return value
+        return self._value_accessor(self.system_data)
 
 
-class BeszelSensor(CoordinatorEntity, SensorEntity):
+class BeszelSensor(BeszelCoordinatorEntity, SensorEntity):
     """Representation of a Beszel Sensor."""
 
     _attr_has_entity_name = True
 
-    def __init__(
-        self,
-        coordinator,
-        system_id,
-        system_name,
-        api_key,
-        name_suffix,
-        unit,
-        device_class,
-        state_class,
-        icon,
-        data_source_key,
-        enabled_by_default=True,
-        options=None,
-        value_func=None,
-    ):
+    def __init__(self, coordinator, system_id, system_name, description):
         """Initialize the sensor."""
         super().__init__(coordinator)
-        self._api_key = api_key
-        self._data_source_key = data_source_key
+        api_key = description.key
+        data_source_key = description.data_source_key
+        self.entity_description = description
         self._system_id = system_id
         self._system_name = system_name
-        self._attr_device_class = device_class
-        self._attr_entity_registry_enabled_default = enabled_by_default
-        self._attr_name = f"{name_suffix}"
-        self._attr_native_unit_of_measurement = unit
-        self._attr_state_class = state_class
-        self._attr_unique_id = (
-            f"{DOMAIN}_{self._system_id}_{self._data_source_key}_{self._api_key}"
-        )
+        self._attr_unique_id = f"{DOMAIN}_{self._system_id}_{data_source_key}_{api_key}"
         self._calculated_unit_of_measurement = None
-        self._icon_definition = icon
-        self._value_func = value_func
-
-        if device_class == SensorDeviceClass.ENUM and options:
-            self._attr_options = options
-
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, self._system_id)},
-            "manufacturer": "Beszel",
-            "model": "Monitored System",
-            "name": self._system_name,
-        }
-
-        initial_system_data = coordinator.data.get(self._system_id, {})
-        if initial_system_data and not initial_system_data.get("error"):
-            agent_version = initial_system_data.get("info", {}).get(
-                ATTR_AGENT_VERSION, "Unknown"
-            )
-            os_type_raw = initial_system_data.get("info", {}).get(ATTR_OS)
-            os_name = self._map_os_type_to_name(os_type_raw)
-            self._attr_device_info["sw_version"] = agent_version
-            if os_name != "Unknown":
-                self._attr_device_info["model"] = os_name
+        self._data_sections = (data_source_key,)
+        self._is_os_sensor = api_key == ATTR_OS and data_source_key == "info"
+        self._is_uptime_sensor = api_key == ATTR_UPTIME and data_source_key == "info"
+
+        if self._is_uptime_sensor:
+            self._value_accessor = self._read_uptime
+        else:
+            self._value_accessor = _make_system_accessor(description)
+
+        self._attr_device_info = coordinator.device_infos.get(system_id)
+        if data_source_key == "stats" and api_key in HISTORY_STATS_KEYS:
+            self._history_path = (api_key,)
 
     def _calculate_uptime_value_and_unit(self, total_seconds):
         """Calculate uptime value and unit based on total seconds."""
@@ -708,52 +1006,25 @@ class BeszelSensor(CoordinatorEntity, SensorEntity):
             return int(val) if val.is_integer() else val, unit
         return val, unit
 
-    @callback
-    def _handle_coordinator_update(self):
-        """Handle updated data from the coordinator."""
-        current_data = self.coordinator.data.get(self._system_id, {})
-        if current_data and not current_data.get("error"):
-            new_agent_version = current_data.get("info", {}).get(ATTR_AGENT_VERSION)
-            new_os_raw = current_data.get("info", {}).get(ATTR_OS)
-            new_os_name = self._map_os_type_to_name(new_os_raw)
-
-            if (
-                new_agent_version
-                and self._attr_device_info.get("sw_version") != new_agent_version
-            ):
-                self._attr_device_info["sw_version"] = new_agent_version
-
-            if (
-                new_os_name != "Unknown"
-                and self._attr_device_info.get("model") != new_os_name
-            ):
-                self._attr_device_info["model"] = new_os_name
-
-        super()._handle_coordinator_update()
-
-    def _map_os_type_to_icon(self, os_type_raw):
-        """Map OS type code to an icon string."""
-        if os_type_raw == 0:
-            return "mdi:linux"
-        if os_type_raw == 1:
-            return "mdi:apple"
-        if os_type_raw == 2:
-            return "mdi:microsoft-windows"
-        if os_type_raw == 3:
-            return "mdi:freebsd"
-        return None
+    def _read_uptime(self, system_data):
+        """Read uptime, scaling it to a unit that fits its magnitude."""
+        self._calculated_unit_of_measurement = (
+            self.entity_description.native_unit_of_measurement
+        )
 
-    def _map_os_type_to_name(self, os_type_raw):
-        """Map OS type code to a human-readable name."""
-        if os_type_raw == 0:
-            return "Linux"
-        if os_type_raw == 1:
-            return "Darwin (macOS)"
-        if os_type_raw == 2:
-            return "Windows"
-        if os_type_raw == 3:
-            return "FreeBSD"
-        return "Unknown"
+        raw_seconds_val = system_data.get("info", {}).get(ATTR_UPTIME)
+        if raw_seconds_val is None:
+            return None
+        try:
+            total_seconds = float(raw_seconds_val)
+        except (ValueError, TypeError):
+            return raw_seconds_val
+
+        if total_seconds < 0:
+            return None
+
+        val, _ = self._calculate_uptime_value_and_unit(total_seconds)
+        return val
 
     @property
     def available(self):
@@ -769,73 +1040,25 @@ class BeszelSensor(CoordinatorEntity, SensorEntity):
     @property
     def icon(self):
         """Return the icon of the sensor."""
-        if self._api_key == ATTR_OS and self._data_source_key == "info":
-            os_type_raw = self.system_data.get("info", {}).get(ATTR_OS)
-            mapped_icon = self._map_os_type_to_icon(os_type_raw)
+        if self._is_os_sensor:
+            mapped_icon = OS_TYPE_ICONS.get(
+                self.system_data.get("info", {}).get(ATTR_OS)
+            )
             if mapped_icon:
                 return mapped_icon
-        return self._icon_definition
+        return super().icon
 
     @property
     def native_unit_of_measurement(self):
         """Return the dynamic unit of measurement for uptime, or default."""
-        if self._api_key == ATTR_UPTIME and self._data_source_key == "info":
+        if self._is_uptime_sensor:
             return self._calculated_unit_of_measurement
         return super().native_unit_of_measurement
 
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        # Handle Status sensor capitalization
-        if self._data_source_key == "status":
-            current_status = self.system_data.get("status", "unknown")
-            return current_status.title()
-
-        # Handle Uptime sensor with dynamic units
-        if self._api_key == ATTR_UPTIME and self._data_source_key == "info":
-            self._calculated_unit_of_measurement = self._attr_native_unit_of_measurement
-
-            raw_seconds_val = self.system_data.get("info", {}).get(ATTR_UPTIME)
-            if raw_seconds_val is None:
-                return None
-            try:
-                total_seconds = float(raw_seconds_val)
-            except (ValueError, TypeError):
-                return raw_seconds_val
-
-            if total_seconds < 0:
-                return None
-
-            val, _ = self._calculate_uptime_value_and_unit(total_seconds)
-            return val
-
-        # Default handling for other sensors
-        data_dict = self.system_data.get(self._data_source_key, {})
-
-        if not isinstance(data_dict, dict):
-            return None
-
-        if self._value_func:
-            return self._value_func(data_dict)
-
-        value = data_dict.get(self._api_key)
-
-        if (
-            value is None
-            and self._attr_native_unit_of_measurement
-            == UnitOfDataRate.MEGABYTES_PER_SECOND
-        ):
-            value = 0.0
-
-        if self._api_key == ATTR_OS and self._data_source_key == "info":
-            return self._map_os_type_to_name(value)
-
-        if value is not None and self._attr_native_unit_of_measurement == PERCENTAGE:
-            try:
-                return round(float(value), 2)
-            except (ValueError, TypeError):
-                return value
-        return value
+        return self._value_accessor(self.system_data)
 
     @property
     def system_data(self):
@@ -859,36 +1082,67 @@ class BeszelTemperatureSensor(BeszelSensor):
                 processed_key_name = processed_key_name.replace("Nvme", "NVME")
             name_to_use = f"Temperature {processed_key_name}"
 
-        super().__init__(
-            coordinator,
-            system_id,
-            system_name,
-            temp_sensor_key,
-            name_to_use,
-            UnitOfTemperature.CELSIUS,
-            SensorDeviceClass.TEMPERATURE,
-            SensorStateClass.MEASUREMENT,
-            "mdi:thermometer",
-            "stats",
-            True,
+        super().__init__(coordinator, system_id, system_name, SENSOR_TYPE_TEMPERATURE)
+        self._attr_name = name_to_use
+        self._attr_unique_id = f"{DOMAIN}_{system_id}_stats_{temp_sensor_key}"
+        if "cpu" in key_lower_for_name or "thermal" in key_lower_for_name:
+            self._attr_icon = "mdi:cpu-64-bit"
+        self._history_path = (ATTR_TEMPERATURES, temp_sensor_key)
+        self._value_accessor = self._read_temperature
+
+    def _read_temperature(self, system_data):
+        """Read this probe's temperature."""
+        temps_dict = system_data.get("stats", {}).get(ATTR_TEMPERATURES, {})
+        return _round_temperature(temps_dict.get(self._temp_sensor_key))
+
+
+class BeszelHubSensor(BeszelCoordinatorEntity, SensorEntity):
+    """Fleet-wide aggregate sensor on the Beszel Hub device."""
+
+    _attr_has_entity_name = True
+    _data_sections = ()
+    # Not tied to one system, so every refresh is checked for a new state
+    _system_id = None
+    _unrecorded_attributes = frozenset({"top_systems"})
+
+    def __init__(self, coordinator, description):
+        """Initialize the hub sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        self._attr_unique_id = (
+            f"{DOMAIN}_{coordinator.config_entry.entry_id}_hub_{description.key}"
         )
+        self._attr_device_info = coordinator.hub_device_info
 
     @property
-    def icon(self):
-        """Return the icon of the temperature sensor."""
-        key_lower = self._temp_sensor_key.lower()
-        if "cpu" in key_lower or "thermal" in key_lower:
-            return "mdi:cpu-64-bit"
-        return super().icon
+    def extra_state_attributes(self):
+        """Return the systems ranked highest for this aggregate, if any."""
+        attributes_key = self.entity_description.attributes_key
+        if attributes_key is None:
+            return None
+        return {"top_systems": self.coordinator.hub_aggregates.get(attributes_key)}
 
     @property
     def native_value(self):
-        """Return the state of the sensor."""
-        temps_dict = self.system_data.get("stats", {}).get(ATTR_TEMPERATURES, {})
-        value = temps_dict.get(self._temp_sensor_key)
-        if value is not None:
-            try:
-                return round(float(value), 1)
-            except (ValueError, TypeError):
-                return None
-        return None
+        """Return the aggregate value."""
+        return self.coordinator.hub_aggregates.get(self.entity_description.key)
+
+
+class BeszelDiagnosticSensor(BeszelHubSensor):
+    """Request and refresh instrumentation sensor on the Beszel Hub device."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _unrecorded_attributes = frozenset({MATCH_ALL})
+
+    @property
+    def extra_state_attributes(self):
+        """Return the per-endpoint or per-system breakdown, if any."""
+        attributes_key = self.entity_description.attributes_key
+        if attributes_key is None:
+            return None
+        return {attributes_key: self.coordinator.metrics.get(attributes_key)}
+
+    @property
+    def native_value(self):
+        """Return the instrumentation value."""
+        return self.coordinator.metrics.get(self.entity_description.key)
@@ -0,0 +1,158 @@
+"""Tests for the Beszel API client against a fake PocketBase."""
+
+import asyncio
+import base64
+from datetime import datetime, timedelta, timezone
+import json
+import re
+import time
+
+from custom_components.beszel.api import (
+    BeszelApiClient,
+    build_systems_filter,
+    system_matches,
+)
+
+HISTORY_RECORDS = 5000
+
+
+def _token():
+    """Return an unsigned PocketBase-style JWT valid for an hour."""
+    payload = json.dumps({"exp": time.time() + 3600}).encode()
+    return "header." + base64.urlsafe_b64encode(payload).decode().rstrip("=") + ".sig"
+
+
+class FakeResponse:
+    """Response returned by the fake session."""
+
+    def __init__(self, status, data):
+        self.status = status
+        self._body = json.dumps(data).encode()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def read(self):
+        return self._body
+
+
+class FakePocketBase:
+    """Session serving a weeks-long 1m stats history, counting every request."""
+
+    def __init__(self, system_ids):
+        self.requests = []
+        self.stats = {
+            system_id: [
+                {"system": system_id, "type": "1m", "stats": {"cpu": index}}
+                for index in range(HISTORY_RECORDS)
+            ]
+            for system_id in system_ids
+        }
+
+    def request(self, method, url, params=None, **kwargs):
+        self.requests.append((method, url, params))
+        if url.endswith("/auth-with-password"):
+            return FakeResponse(200, {"token": _token()})
+
+        # Newest record first, as requested with sort=-created
+        wanted = re.findall(r'system="([^"]+)"', params.get("filter", ""))
+        records = [
+            record
+            for system_id in wanted
+            for record in reversed(self.stats.get(system_id, []))
+        ]
+        page, per_page = int(params["page"]), int(params["perPage"])
+        items = records[(page - 1) * per_page : page * per_page]
+        return FakeResponse(200, {"page": page, "perPage": per_page, "items": items})
+
+    @property
+    def list_requests(self):
+        return [request for request in self.requests if request[0] == "GET"]
+
+
+def _run(system_ids, fetch):
+    """Run a fetch against a fresh fake hub and return its result and the hub."""
+    hub = FakePocketBase(system_ids)
+
+    async def _fetch():
+        client = BeszelApiClient(
+            "hub.local", "user", "secret", hub, requests_per_second=0
+        )
+        try:
+            return await fetch(client)
+        finally:
+            client.close()
+
+    return asyncio.run(_fetch()), hub
+
+
+def test_latest_system_stats_costs_one_request():
+    """Only the newest record is fetched, however long the history is."""
+    stats, hub = _run(
+        ["sys1"], lambda client: client.async_get_latest_system_stats("sys1")
+    )
+
+    assert stats == {"cpu": HISTORY_RECORDS - 1}
+    assert len(hub.list_requests) == 1
+    params = hub.list_requests[0][2]
+    assert params["perPage"] == 1
+    assert 'type="1m"' in params["filter"]
+
+
+def test_latest_system_stats_without_records():
+    """A system without stats yields None after a single request."""
+    stats, hub = _run(
+        ["sys1"], lambda client: client.async_get_latest_system_stats("sys2")
+    )
+
+    assert stats is None
+    assert len(hub.list_requests) == 1
+
+
+def test_latest_system_stats_batch_picks_newest_per_system():
+    """The batch fetch keeps the newest record of each system."""
+    since = datetime.now(timezone.utc) - timedelta(minutes=2)
+    stats, hub = _run(
+        ["sys1", "sys2"],
+        lambda client: client.async_get_latest_system_stats_batch(
+            ["sys1", "sys2"], since
+        ),
+    )
+
+    assert stats == {
+        "sys1": {"cpu": HISTORY_RECORDS - 1},
+        "sys2": {"cpu": HISTORY_RECORDS - 1},
+    }
+
+
+def test_systems_filter_widens_globs_to_anchored_like():
+    """Glob wildcards map to `%`, so the hub applies them as a raw LIKE pattern."""
+    assert build_systems_filter(["db-?", "web"], ["db-9*", "old"], ["up"]) == (
+        '(name~"db-%" || name="web" || id="web") && name!~"db-9%" && '
+        '(name!="old" && id!="old") && (status="up")'
+    )
+    assert build_systems_filter(exclude=["db-?"]) is None
+    assert build_systems_filter() is None
+
+
+def test_systems_filter_through_relation():
+    """Stats records are selected through their system relation."""
+    assert build_systems_filter(["db-*"], ["old"], ["up"], relation="system") == (
+        '(system.name~"db-%") && (system.name!="old" && system!="old") && '
+        '(system.status="up")'
+    )
+
+
+def test_system_matches_applies_globs_exactly():
+    """`?` matches exactly one character and globs are anchored."""
+    include, exclude = ["db-?", "web"], ["db-9*"]
+
+    assert system_matches({"id": "a", "name": "DB-1"}, include, exclude)
+    assert system_matches({"id": "web", "name": "frontend"}, include, exclude)
+    assert not system_matches({"id": "b", "name": "db-10"}, include, exclude)
+    assert not system_matches({"id": "c", "name": "db_1"}, include, exclude)
+    assert not system_matches({"id": "d", "name": "old-db-1"}, include, exclude)
+    assert not system_matches({"id": "e", "name": "db-9"}, include, exclude)